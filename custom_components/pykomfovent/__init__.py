@@ -4,13 +4,15 @@ from homeassistant.components.http import StaticPathConfig
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
 
-from .const import DOMAIN
-from .coordinator import KomfoventCoordinator
+from .const import CONF_BACKGROUND_SETUP, DATA_DEVICE_INDEX, DOMAIN
+from .coordinator import KomfoventCoordinator, snapshot_store
 from .services import async_setup_services, async_unload_services
 
 PLATFORMS = [
     Platform.BINARY_SENSOR,
+    Platform.CALENDAR,
     Platform.NUMBER,
     Platform.SELECT,
     Platform.SENSOR,
@@ -20,9 +22,31 @@ PLATFORMS = [
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     coordinator = KomfoventCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    restored = await coordinator.async_restore_snapshot()
+    if restored or entry.data.get(CONF_BACKGROUND_SETUP, False):
+        # Serve the last known state (or unavailable entities) right away and read the unit in
+        # the background, so a slow or offline unit does not hold up startup.
+        if not restored:
+            coordinator.last_update_success = False
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN}_first_refresh"
+        )
+    else:
+        await coordinator.async_config_entry_first_refresh()
+    # Mode config registers and the schedule change rarely; read them once in the background
+    entry.async_create_background_task(
+        hass, coordinator.config.async_refresh(), f"{DOMAIN}_config_refresh"
+    )
+    entry.async_create_background_task(
+        hass, coordinator.async_refresh_schedule(), f"{DOMAIN}_schedule_refresh"
+    )
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, **coordinator.device_info
+    )
+    index: dict[str, KomfoventCoordinator] = hass.data.setdefault(DATA_DEVICE_INDEX, {})
+    index[device.id] = index[coordinator.host] = coordinator
 
     if len(hass.data[DOMAIN]) == 1:
         await async_setup_services(hass)
@@ -39,9 +63,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         coordinator: KomfoventCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        index: dict[str, KomfoventCoordinator] = hass.data.get(DATA_DEVICE_INDEX, {})
+        for key in [key for key, value in index.items() if value is coordinator]:
+            del index[key]
+        # Coordinator shutdowns run after this; send pending writes while the client is open
+        await coordinator.config.write_queue.async_flush()
         await coordinator.client.close()
 
         if not hass.data[DOMAIN]:
             await async_unload_services(hass)
 
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await snapshot_store(hass, entry.entry_id).async_remove()
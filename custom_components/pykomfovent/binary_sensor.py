@@ -10,12 +10,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from pykomfovent import KomfoventState
 
 from .const import DOMAIN, FILTER_WARNING_THRESHOLD
 from .coordinator import KomfoventCoordinator
+from .entity import KomfoventEntity
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -51,7 +51,7 @@ async def async_setup_entry(
     async_add_entities(KomfoventBinarySensor(coordinator, desc) for desc in BINARY_SENSORS)
 
 
-class KomfoventBinarySensor(CoordinatorEntity[KomfoventCoordinator], BinarySensorEntity):
+class KomfoventBinarySensor(KomfoventEntity[KomfoventCoordinator], BinarySensorEntity):
     entity_description: KomfoventBinarySensorDescription
     _attr_has_entity_name = True
 
@@ -60,7 +60,7 @@ class KomfoventBinarySensor(CoordinatorEntity[KomfoventCoordinator], BinarySenso
         coordinator: KomfoventCoordinator,
         description: KomfoventBinarySensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.value_fn)
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.host}_{description.key}"
         self._attr_translation_key = description.translation_key
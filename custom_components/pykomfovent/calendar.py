@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN
+from .coordinator import KomfoventCoordinator
+from .entity import KomfoventEntity
+from .schedule import PROGRAMS, ScheduleMode, ScheduleTimeline
+
+
+async def async_setup_entry(
+    hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
+) -> None:
+    coordinator: KomfoventCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_add_entities(
+        KomfoventScheduleCalendar(coordinator, program) for program in range(PROGRAMS)
+    )
+
+
+def _no_value(_data: object) -> None:
+    return None
+
+
+def _event(start: datetime, end: datetime, mode: ScheduleMode) -> CalendarEvent:
+    return CalendarEvent(start=start, end=end, summary=mode.name.capitalize())
+
+
+class KomfoventScheduleCalendar(KomfoventEntity[KomfoventCoordinator], CalendarEntity):
+    _attr_has_entity_name = True
+    _attr_translation_key = "schedule_program"
+
+    def __init__(self, coordinator: KomfoventCoordinator, program: int) -> None:
+        # Content follows the schedule listener; polls only matter for availability
+        super().__init__(coordinator, context=_no_value)
+        self._program = program
+        self._attr_unique_id = f"{coordinator.host}_schedule_program_{program}"
+        self._attr_translation_placeholders = {"program": str(program + 1)}
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_schedule_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def _timeline(self) -> ScheduleTimeline | None:
+        timelines = self.coordinator.timelines
+        return timelines[self._program] if self._program < len(timelines) else None
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        if (timeline := self._timeline) is None:
+            return None
+        now = dt_util.now()
+        upcoming = next(timeline.occurrences(now, now + timedelta(days=8)), None)
+        return _event(*upcoming) if upcoming else None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        if (timeline := self._timeline) is None:
+            return []
+        return [
+            _event(*occurrence)
+            for occurrence in timeline.occurrences(
+                dt_util.as_local(start_date), dt_util.as_local(end_date)
+            )
+        ]
@@ -12,13 +12,18 @@ from pykomfovent import (
 )
 
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_BACKGROUND_SETUP,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
     CONF_USERNAME,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
     DOMAIN,
     MAX_SCAN_INTERVAL,
+    MAX_SLOW_SCAN_INTERVAL,
     MIN_SCAN_INTERVAL,
 )
 
@@ -156,6 +161,23 @@ class KomfoventOptionsFlow(OptionsFlow):
                     ): vol.All(
                         vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SCAN_INTERVAL)
                     ),
+                    vol.Optional(
+                        CONF_SLOW_SCAN_INTERVAL,
+                        default=self._config_entry.data.get(
+                            CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_SCAN_INTERVAL, max=MAX_SLOW_SCAN_INTERVAL),
+                    ),
+                    vol.Optional(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self._config_entry.data.get(CONF_ADAPTIVE_POLLING, False),
+                    ): bool,
+                    vol.Optional(
+                        CONF_BACKGROUND_SETUP,
+                        default=self._config_entry.data.get(CONF_BACKGROUND_SETUP, False),
+                    ): bool,
                 }
             ),
         )
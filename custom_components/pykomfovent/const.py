@@ -1,13 +1,30 @@
 DOMAIN = "pykomfovent"
+# device_id and host -> coordinator, kept next to hass.data[DOMAIN] for service lookups
+DATA_DEVICE_INDEX = f"{DOMAIN}_device_index"
 DEFAULT_SCAN_INTERVAL = 30
 MIN_SCAN_INTERVAL = 10
 MAX_SCAN_INTERVAL = 300
+DEFAULT_SLOW_SCAN_INTERVAL = 300
+MAX_SLOW_SCAN_INTERVAL = 3600
+ADAPTIVE_BACKOFF_FACTOR = 1.5
+ADAPTIVE_TEMP_SLOPE = 0.5  # °C per minute
+WRITE_CONFIRM_DELAY = 2
+WRITE_COALESCE_WINDOW = 0.25
+CONFIG_SCAN_INTERVAL = 3600
+MAX_PARALLEL_DEVICE_CALLS = 4
+SCHEDULE_CACHE_TTL = 300
+SCHEDULE_REFRESH_DELAY = 10
+SNAPSHOT_SAVE_DELAY = 300
+STORAGE_VERSION = 1
 FILTER_WARNING_THRESHOLD = 80
 
 CONF_HOST = "host"
 CONF_USERNAME = "username"
 CONF_PASSWORD = "password"
 CONF_SCAN_INTERVAL = "scan_interval"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+CONF_BACKGROUND_SETUP = "background_setup"
 
 # Mode mappings (key -> possible values from device in different languages)
 MODES = {
@@ -1,10 +1,21 @@
+import asyncio
 import logging
-from datetime import timedelta
+import random
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, fields, replace
+from datetime import datetime, timedelta
+from functools import partial
+from time import monotonic
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from pykomfovent import (
     KomfoventAuthError,
@@ -14,35 +25,105 @@ from pykomfovent import (
 )
 
 from .const import (
+    ADAPTIVE_BACKOFF_FACTOR,
+    ADAPTIVE_TEMP_SLOPE,
+    CONF_ADAPTIVE_POLLING,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
     CONF_USERNAME,
+    CONFIG_SCAN_INTERVAL,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_SLOW_SCAN_INTERVAL,
     DOMAIN,
+    MAX_SCAN_INTERVAL,
+    MODES,
+    SCHEDULE_CACHE_TTL,
+    SCHEDULE_REFRESH_DELAY,
+    SNAPSHOT_SAVE_DELAY,
+    STORAGE_VERSION,
+    WRITE_CONFIRM_DELAY,
 )
+from .request_lane import RequestLane
+from .schedule import (
+    Schedule,
+    ScheduleTimeline,
+    parse_schedule_config,
+    registers_schedule,
+    schedule_registers,
+    validate_schedule,
+)
+from .transport import KomfoventTransport
+from .write_queue import RegisterWriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class KomfoventCoordinator(DataUpdateCoordinator[KomfoventState]):
-    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
-        self.client = KomfoventClient(
-            entry.data[CONF_HOST],
-            entry.data[CONF_USERNAME],
-            entry.data[CONF_PASSWORD],
-        )
+def mode_key(mode: str) -> str | None:
+    mode = mode.upper()
+    for key, values in MODES.items():
+        if mode in values:
+            return key
+    return None
+
+
+def snapshot_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+def _localized_mode(current: str, key: str) -> str:
+    # Report the optimistic mode in the same language the device uses
+    current = current.upper()
+    index = next((v.index(current) for v in MODES.values() if current in v), 0)
+    values = MODES[key]
+    return values[min(index, len(values) - 1)]
+
+
+def _is_volatile(previous: KomfoventState, current: KomfoventState, elapsed: float) -> bool:
+    if (
+        previous.mode != current.mode
+        or previous.supply_temp_setpoint != current.supply_temp_setpoint
+    ):
+        return True
+    minutes = max(elapsed, 1.0) / 60
+    for before, after in (
+        (previous.supply_temp, current.supply_temp),
+        (previous.extract_temp, current.extract_temp),
+        (previous.outdoor_temp, current.outdoor_temp),
+    ):
+        if (
+            before is not None
+            and after is not None
+            and abs(after - before) / minutes >= ADAPTIVE_TEMP_SLOPE
+        ):
+            return True
+    return False
+
+
+class KomfoventBaseCoordinator[DataT](DataUpdateCoordinator[DataT]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        name: str,
+        update_interval: timedelta,
+        **kwargs: Any,
+    ) -> None:
         self.host: str = entry.data[CONF_HOST]
-        self._unavailable_logged = False
+        # Data restored from the snapshot has not been confirmed by the unit yet
+        self.stale = False
+        # Last (success, stale, data) listeners were notified of; None until the first notification
+        self._notified: tuple[bool, bool | None, DataT | None] = (False, None, None)
 
         super().__init__(
             hass,
             _LOGGER,
             config_entry=entry,
-            name=DOMAIN,
-            update_interval=timedelta(
-                seconds=entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-            ),
+            name=name,
+            update_interval=update_interval,
+            always_update=False,
+            **kwargs,
         )
 
     @property
@@ -54,12 +135,397 @@ class KomfoventCoordinator(DataUpdateCoordinator[KomfoventState]):
             model="C6",
         )
 
+    @callback
+    def async_update_listeners(self) -> None:
+        # Entities register their value function as listener context; only notify the ones
+        # whose value differs from the previously notified snapshot.
+        previous_success, previous_stale, previous_data = self._notified
+        self._notified = (self.last_update_success, self.stale, self.data)
+        notify_all = (
+            previous_success != self.last_update_success
+            or previous_stale != self.stale
+            or previous_data is None
+            or self.data is None
+        )
+        for update_callback, context in list(self._listeners.values()):
+            if notify_all or not callable(context) or context(previous_data) != context(self.data):
+                update_callback()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        # With always_update=False a refresh that merely confirms restored data notifies nobody
+        if self.stale != self._notified[1]:
+            self.async_update_listeners()
+
+
+class KomfoventConfigCoordinator(KomfoventBaseCoordinator[dict[int, str]]):
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        transport: KomfoventTransport,
+        on_update: CALLBACK_TYPE,
+    ) -> None:
+        self.transport = transport
+        self.write_queue = RegisterWriteQueue(hass, entry, transport)
+        self._on_update = on_update
+
+        super().__init__(
+            hass,
+            entry,
+            name=f"{DOMAIN}_config",
+            update_interval=timedelta(seconds=CONFIG_SCAN_INTERVAL),
+        )
+
+    async def _async_update_data(self) -> dict[int, str]:
+        try:
+            registers = await self.transport.get_config_registers()
+        except (KomfoventAuthError, KomfoventConnectionError) as err:
+            raise UpdateFailed(
+                f"Error reading configuration: {err}", retry_after=MAX_SCAN_INTERVAL
+            ) from err
+        self.stale = False
+        self._on_update()
+        return registers
+
+    async def async_write_register(self, register: int, value: str) -> None:
+        await self.async_write_registers({register: value})
+
+    async def async_write_registers(self, registers: dict[int, str]) -> None:
+        await self.write_queue.write(registers)
+        self.async_set_updated_data({**(self.data or {}), **registers})
+        self._on_update()
+
+    async def async_shutdown(self) -> None:
+        await self.write_queue.async_flush()
+        await super().async_shutdown()
+
+
+class KomfoventCoordinator(KomfoventBaseCoordinator[KomfoventState]):
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        self.client = KomfoventClient(
+            entry.data[CONF_HOST],
+            entry.data[CONF_USERNAME],
+            entry.data[CONF_PASSWORD],
+        )
+        self.transport = KomfoventTransport(self.client, RequestLane(hass))
+        self.slow_update_interval = timedelta(
+            seconds=entry.data.get(CONF_SLOW_SCAN_INTERVAL, DEFAULT_SLOW_SCAN_INTERVAL)
+        )
+        self.scan_interval: int = entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self.adaptive_polling: bool = entry.data.get(CONF_ADAPTIVE_POLLING, False)
+        self._detail_refreshed_at: float | None = None
+        # Last state read from the unit and when; self.data may hold an optimistic write instead
+        self._sample: tuple[float, KomfoventState] | None = None
+        self._unavailable_logged = False
+        self.failures = 0
+        self.retry_after: float | None = None
+        self._unconfirmed: dict[str, Any] = {}
+        self._schedule: tuple[float, dict, list[Schedule]] | None = None
+        self._schedule_raw: dict | None = None
+        self._schedule_lock = asyncio.Lock()
+        self.timelines: tuple[ScheduleTimeline, ...] = ()
+        self.timeline: ScheduleTimeline | None = None
+        self._unsub_transition: CALLBACK_TYPE | None = None
+        self._unsub_transition_poll: CALLBACK_TYPE | None = None
+        self._schedule_listeners: list[CALLBACK_TYPE] = []
+        self._store = snapshot_store(hass, entry.entry_id)
+        self._save_scheduled = False
+
+        super().__init__(
+            hass,
+            entry,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=self.scan_interval),
+            # Refreshes are requested after writes; defer them so the device has applied the
+            # change and several writes in a row are confirmed by a single poll.
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=WRITE_CONFIRM_DELAY, immediate=False
+            ),
+        )
+        self.config = KomfoventConfigCoordinator(
+            hass, entry, self.transport, self._async_schedule_save
+        )
+
+    async def async_restore_snapshot(self) -> bool:
+        snapshot = await self._store.async_load()
+        if not snapshot:
+            return False
+        state = snapshot.get("state")
+        # Ignore a state saved by a library version with different fields
+        if state and set(state) == {field.name for field in fields(KomfoventState)}:
+            self.data = KomfoventState(**state)
+        if config := snapshot.get("config"):
+            self.config.data = {int(register): value for register, value in config.items()}
+            self.config.stale = True
+        if schedule := snapshot.get("schedule"):
+            # Serve it until the first read; never counts as fresh for max_age
+            self._async_set_schedule(schedule, float("-inf"))
+        self.stale = True
+        return self.data is not None
+
+    @callback
+    def _async_schedule_save(self) -> None:
+        # Store.async_delay_save restarts its delay on every call; only schedule once so frequent
+        # polls cannot postpone the save indefinitely.
+        if not self._save_scheduled and not self._shutdown_requested:
+            self._save_scheduled = True
+            self._store.async_delay_save(self._snapshot, SNAPSHOT_SAVE_DELAY)
+
+    @callback
+    def _snapshot(self) -> dict[str, Any]:
+        self._save_scheduled = False
+        return {
+            "state": asdict(self.data) if self.data is not None else None,
+            "config": self.config.data,
+            "schedule": self._schedule_raw,
+        }
+
+    @callback
+    def _schedule_refresh(self) -> None:
+        # Give every loaded entry its own slot within the interval so units do not all poll in
+        # lockstep after a restart; retries after connection failures keep their backoff.
+        interval = self.update_interval
+        entry_ids = sorted(self.hass.data.get(DOMAIN, {}))
+        entry_id = self.config_entry.entry_id if self.config_entry else None
+        if interval is None or self.failures or entry_id not in entry_ids:
+            super()._schedule_refresh()
+            return
+        seconds = interval.total_seconds()
+        phase = seconds * entry_ids.index(entry_id) / len(entry_ids)
+        delay = (phase - int(self.hass.loop.time())) % seconds
+        if delay < seconds / 2:
+            delay += seconds
+        self.update_interval = timedelta(seconds=delay)
+        try:
+            super()._schedule_refresh()
+        finally:
+            self.update_interval = interval
+
+    async def async_request_refresh(self) -> None:
+        # Refreshes are requested right after writes; poll at full speed until things settle.
+        if self.adaptive_polling:
+            self.update_interval = timedelta(seconds=self.scan_interval)
+        await super().async_request_refresh()
+
+    async def async_set_mode(self, mode: str) -> None:
+        current = self.data.mode if self.data else ""
+        await self._async_write_through(
+            partial(self.transport.set_mode, mode), mode=_localized_mode(current, mode)
+        )
+
+    async def async_set_supply_temp(self, value: float) -> None:
+        await self._async_write_through(
+            partial(self.transport.set_supply_temp, value), supply_temp_setpoint=value
+        )
+
+    async def async_get_schedule(
+        self, max_age: float = SCHEDULE_CACHE_TTL
+    ) -> tuple[dict, list[Schedule]]:
+        now = monotonic()
+        schedule = self._schedule
+        if schedule is None or now - schedule[0] > max_age:
+            raw = await self.transport.get_schedule()
+            # Callers sharing one read only parse it once
+            if self._schedule is not None and self._schedule[1] is raw:
+                schedule = self._schedule
+            else:
+                schedule = self._async_set_schedule(raw, now)
+                self._async_schedule_save()
+        return schedule[1], schedule[2]
+
+    @callback
+    def _async_set_schedule(
+        self, raw: dict, fetched_at: float
+    ) -> tuple[float, dict, list[Schedule]]:
+        schedules = parse_schedule_config(raw)
+        self._schedule = (fetched_at, raw, schedules)
+        self._schedule_raw = raw
+        self.timelines = tuple(ScheduleTimeline.from_schedule(s) for s in schedules)
+        program = raw.get("current_program", 0)
+        if isinstance(program, int) and 0 <= program < len(schedules):
+            self.timeline = self.timelines[program]
+            self._arm_transition_refresh()
+        self._async_update_schedule_listeners()
+        return self._schedule
+
+    async def async_refresh_schedule(self) -> None:
+        try:
+            await self.async_get_schedule()
+        except (KomfoventAuthError, KomfoventConnectionError) as err:
+            _LOGGER.debug("Failed to read schedule from Komfovent %s: %s", self.host, err)
+        self._arm_transition_refresh()
+
+    @callback
+    def async_add_schedule_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        # Entities derived from the schedule are updated when it is re-read and at each
+        # scheduled transition, not on every poll.
+        self._schedule_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._schedule_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def _async_update_schedule_listeners(self) -> None:
+        for update_callback in list(self._schedule_listeners):
+            update_callback()
+
+    @callback
+    def _arm_transition_refresh(self) -> None:
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        if self.timeline is None or self._shutdown_requested:
+            return
+        upcoming = self.timeline.next_transition(dt_util.now())
+        if upcoming is None:
+            return
+        self._unsub_transition = async_track_point_in_time(
+            self.hass, self._async_handle_transition, upcoming[0]
+        )
+
+    @callback
+    def _async_handle_transition(self, _now: datetime) -> None:
+        # Poll shortly after the scheduled mode change instead of waiting for the interval
+        self._unsub_transition = None
+        if self._unsub_transition_poll is not None:
+            self._unsub_transition_poll()
+        self._unsub_transition_poll = async_call_later(
+            self.hass, SCHEDULE_REFRESH_DELAY, self._async_refresh_after_transition
+        )
+        self._async_update_schedule_listeners()
+
+    async def _async_refresh_after_transition(self, _now: datetime) -> None:
+        self._unsub_transition_poll = None
+        await self.async_request_refresh()
+        await self.async_refresh_schedule()
+
+    async def async_set_schedule(self, commands: dict[str, int]) -> None:
+        # Serialize the whole read-diff-write so each call diffs against what the unit holds
+        async with self._schedule_lock:
+            raw, schedules = await self.async_get_schedule(0)
+            current = schedule_registers(raw)
+            commands = {
+                register: value
+                for register, value in commands.items()
+                if current.get(register) != value
+            }
+            if not commands:
+                return
+            # Reject conflicts in the programs this write touches before anything reaches the unit
+            proposed = parse_schedule_config(registers_schedule({**current, **commands}))
+            for before, after in zip(schedules, proposed, strict=True):
+                if before != after:
+                    validate_schedule(after)
+            # Drop the cache even when the write fails; the device may have applied part of it
+            try:
+                await self.transport.set_schedule(commands)
+            finally:
+                self._schedule = None
+                # Recompile the timeline from what the device now reports
+                if self.config_entry is not None:
+                    self.config_entry.async_create_background_task(
+                        self.hass, self.async_refresh_schedule(), f"{DOMAIN}_schedule_refresh"
+                    )
+
+    async def async_shutdown(self) -> None:
+        for unsub in (self._unsub_transition, self._unsub_transition_poll):
+            if unsub is not None:
+                unsub()
+        self._unsub_transition = self._unsub_transition_poll = None
+        await super().async_shutdown()
+        # Write a pending snapshot now; a delayed save outliving the entry would recreate the
+        # file after async_remove_entry or race the Store of a reloaded entry.
+        if self._save_scheduled:
+            await self._store.async_save(self._snapshot())
+
+    async def _async_write_through(
+        self, write: Callable[[], Awaitable[None]], **changes: Any
+    ) -> None:
+        # Only patch live data; async_set_updated_data would mark a failed unit as available
+        previous, succeeded = self.data, self.last_update_success
+        optimistic = previous is not None and succeeded
+        if optimistic:
+            self.async_set_updated_data(replace(previous, **changes))
+        try:
+            await write()
+        except Exception:
+            if optimistic:
+                self.data = previous
+                self.last_update_success = succeeded
+                self.async_update_listeners()
+            raise
+        self._unconfirmed.update(changes)
+        # Fan intensity and heater levels follow mode and setpoint changes; confirm them too
+        self._detail_refreshed_at = None
+        await self.async_request_refresh()
+
+    @callback
+    def _async_refresh_finished(self) -> None:
+        super()._async_refresh_finished()
+        if not self._unconfirmed or not self.last_update_success or self.data is None:
+            return
+        # Fresh device data has replaced the optimistic snapshot; anything the device did not
+        # apply is thereby rolled back.
+        data = self.data
+        rejected = [
+            field
+            for field, value in self._unconfirmed.items()
+            if (
+                mode_key(data.mode) != mode_key(value)
+                if field == "mode"
+                else getattr(data, field) != value
+            )
+        ]
+        if rejected:
+            _LOGGER.warning(
+                "Komfovent %s did not apply %s, rolled back to device state",
+                self.host,
+                ", ".join(rejected),
+            )
+        self._unconfirmed.clear()
+
+    def _backoff(self) -> float:
+        # Exponential backoff from the scan interval with up to 50% jitter on top, so units that
+        # went down together do not all retry at the same moment; never sooner than a normal
+        # poll and never later than the maximum interval.
+        delay = min(self.scan_interval * 2 ** min(self.failures - 1, 16), MAX_SCAN_INTERVAL)
+        return random.uniform(delay, min(delay * 1.5, MAX_SCAN_INTERVAL))
+
+    def _adapt_interval(self, data: KomfoventState, now: float) -> None:
+        sample, self._sample = self._sample, (now, data)
+        if not self.adaptive_polling or self.update_interval is None:
+            return
+        if sample is None or _is_volatile(sample[1], data, now - sample[0]):
+            seconds = self.scan_interval
+        else:
+            seconds = min(
+                self.update_interval.total_seconds() * ADAPTIVE_BACKOFF_FACTOR, MAX_SCAN_INTERVAL
+            )
+        self.update_interval = timedelta(seconds=seconds)
+
     async def _async_update_data(self) -> KomfoventState:
         try:
-            data = await self.client.get_state()
+            now = monotonic()
+            refresh_detail = (
+                self._detail_refreshed_at is None
+                or now - self._detail_refreshed_at >= self.slow_update_interval.total_seconds()
+            )
+            data = await self.transport.get_state(refresh_detail)
+            if refresh_detail:
+                self._detail_refreshed_at = now
+            if data is not self.data:
+                self._async_schedule_save()
+            self.stale = False
+            self._adapt_interval(data, now)
             if self._unavailable_logged:
                 _LOGGER.info("Connection to Komfovent %s restored", self.host)
                 self._unavailable_logged = False
+            self.failures = 0
+            self.retry_after = None
             return data
         except KomfoventAuthError as err:
             raise UpdateFailed(f"Authentication failed: {err}") from err
@@ -67,4 +533,8 @@ class KomfoventCoordinator(DataUpdateCoordinator[KomfoventState]):
             if not self._unavailable_logged:
                 _LOGGER.warning("Connection to Komfovent %s failed: %s", self.host, err)
                 self._unavailable_logged = True
-            raise UpdateFailed(f"Error communicating with device: {err}") from err
+            self.failures += 1
+            self.retry_after = self._backoff()
+            raise UpdateFailed(
+                f"Error communicating with device: {err}", retry_after=self.retry_after
+            ) from err
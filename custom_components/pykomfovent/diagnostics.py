@@ -12,11 +12,8 @@ async def async_get_config_entry_diagnostics(
 ) -> dict[str, Any]:
     coordinator: KomfoventCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    data = coordinator.data
-    if data is None:
-        return {"error": "No data available"}
-
-    return {
+    # Polling and backoff state matter most for a unit that has not answered yet
+    diagnostics: dict[str, Any] = {
         "config_entry": {
             "entry_id": entry.entry_id,
             "version": entry.version,
@@ -26,21 +23,46 @@ async def async_get_config_entry_diagnostics(
         "device": {
             "host": coordinator.host,
         },
-        "state": {
-            "mode": data.mode,
-            "supply_temp": data.supply_temp,
-            "extract_temp": data.extract_temp,
-            "outdoor_temp": data.outdoor_temp,
-            "supply_temp_setpoint": data.supply_temp_setpoint,
-            "extract_temp_setpoint": data.extract_temp_setpoint,
-            "supply_fan_percent": data.supply_fan_percent,
-            "extract_fan_percent": data.extract_fan_percent,
-            "filter_contamination": data.filter_contamination,
-            "power_consumption": data.power_consumption,
-            "flags": data.flags,
-            "flags_binary": bin(data.flags),
-            "is_on": data.is_on,
-            "eco_mode": data.eco_mode,
-            "heating_active": data.heating_active,
+        "polling": {
+            "update_interval": coordinator.update_interval.total_seconds()
+            if coordinator.update_interval
+            else None,
+            "adaptive": coordinator.adaptive_polling,
+        },
+        "backoff": {
+            "failures": coordinator.failures,
+            "retry_after": coordinator.retry_after,
+        },
+        "snapshot": {
+            "stale": coordinator.stale,
+        },
+        "payload_cache": {
+            "hits": coordinator.transport.payload_hits,
+            "misses": coordinator.transport.payload_misses,
+            "hit_rate": coordinator.transport.payload_hit_rate,
         },
     }
+
+    data = coordinator.data
+    if data is None:
+        diagnostics["error"] = "No data available"
+        return diagnostics
+
+    diagnostics["state"] = {
+        "mode": data.mode,
+        "supply_temp": data.supply_temp,
+        "extract_temp": data.extract_temp,
+        "outdoor_temp": data.outdoor_temp,
+        "supply_temp_setpoint": data.supply_temp_setpoint,
+        "extract_temp_setpoint": data.extract_temp_setpoint,
+        "supply_fan_percent": data.supply_fan_percent,
+        "extract_fan_percent": data.extract_fan_percent,
+        "filter_contamination": data.filter_contamination,
+        "power_consumption": data.power_consumption,
+        "flags": data.flags,
+        "flags_binary": bin(data.flags),
+        "is_on": data.is_on,
+        "eco_mode": data.eco_mode,
+        "heating_active": data.heating_active,
+    }
+    return diagnostics
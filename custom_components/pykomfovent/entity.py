@@ -0,0 +1,17 @@
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .coordinator import KomfoventBaseCoordinator
+
+
+class KomfoventEntity[CoordinatorT: KomfoventBaseCoordinator[Any]](CoordinatorEntity[CoordinatorT]):
+    @property
+    def available(self) -> bool:
+        # Restored values stay visible while the unit has not answered since startup
+        return super().available or self.coordinator.stale
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        # True while the value comes from the snapshot restored at startup
+        return {"stale": self.coordinator.stale}
@@ -1,3 +1,4 @@
+from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any
 
@@ -6,11 +7,12 @@ from homeassistant.components.switch import SwitchEntity, SwitchEntityDescriptio
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTemperature
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN
-from .coordinator import KomfoventCoordinator
+from .coordinator import KomfoventConfigCoordinator, KomfoventCoordinator
+from .entity import KomfoventEntity
 
 MODES = ["away", "normal", "intensive", "boost", "hood", "fireplace", "override", "vacation"]
 
@@ -228,74 +230,103 @@ def _build_mode_switches() -> list[ModeConfigSwitchDescription]:
 MODE_NUMBERS = _build_mode_numbers()
 MODE_SWITCHES = _build_mode_switches()
 
+_NUMBERS_BY_KEY = {desc.key: desc for desc in MODE_NUMBERS}
+_SWITCHES_BY_KEY = {desc.key: desc for desc in MODE_SWITCHES}
 
-class ModeConfigNumber(CoordinatorEntity[KomfoventCoordinator], NumberEntity):
+
+def _number_register_value(description: ModeConfigNumberDescription, value: float) -> str:
+    return str(round(value * description.multiplier))
+
+
+def profile_registers(settings: dict[str, Any]) -> dict[int, str]:
+    registers: dict[int, str] = {}
+    for key, value in settings.items():
+        if (number := _NUMBERS_BY_KEY.get(key)) is not None:
+            value = float(value)
+            low, high = number.native_min_value, number.native_max_value
+            if (low is not None and value < low) or (high is not None and value > high):
+                raise ValueError(f"Invalid value for {key}: {value} (allowed {low}-{high})")
+            registers[number.register] = _number_register_value(number, value)
+        elif (switch := _SWITCHES_BY_KEY.get(key)) is not None:
+            registers[switch.register] = "on" if cv.boolean(value) else "0"
+        else:
+            raise ValueError(f"Unknown mode config setting: {key}")
+    return registers
+
+
+def _register_value(register: int) -> Callable[[dict[int, str]], str | None]:
+    return lambda registers: registers.get(register)
+
+
+class ModeConfigNumber(KomfoventEntity[KomfoventConfigCoordinator], NumberEntity):
     entity_description: ModeConfigNumberDescription
     _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.CONFIG
 
     def __init__(
-        self, coordinator: KomfoventCoordinator, description: ModeConfigNumberDescription
+        self, coordinator: KomfoventConfigCoordinator, description: ModeConfigNumberDescription
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=_register_value(description.register))
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.host}_{description.key}"
         self._attr_translation_key = description.translation_key
         self._attr_device_info = coordinator.device_info
-        self._value: float | None = None
 
     @property
     def native_value(self) -> float | None:
-        return self._value
+        if self.coordinator.data is None:
+            return None
+        raw = self.coordinator.data.get(self.entity_description.register)
+        try:
+            return float(raw) / self.entity_description.multiplier if raw else None
+        except ValueError:
+            return None
 
     async def async_set_native_value(self, value: float) -> None:
-        reg = self.entity_description.register
-        mult = self.entity_description.multiplier
-        await self.coordinator.client.set_register(reg, str(int(value * mult)))
-        self._value = value
-        self.async_write_ha_state()
+        await self.coordinator.async_write_register(
+            self.entity_description.register,
+            _number_register_value(self.entity_description, value),
+        )
 
 
-class ModeConfigSwitch(CoordinatorEntity[KomfoventCoordinator], SwitchEntity):
+class ModeConfigSwitch(KomfoventEntity[KomfoventConfigCoordinator], SwitchEntity):
     entity_description: ModeConfigSwitchDescription
     _attr_has_entity_name = True
     _attr_entity_category = EntityCategory.CONFIG
 
     def __init__(
-        self, coordinator: KomfoventCoordinator, description: ModeConfigSwitchDescription
+        self, coordinator: KomfoventConfigCoordinator, description: ModeConfigSwitchDescription
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=_register_value(description.register))
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.host}_{description.key}"
         self._attr_translation_key = description.translation_key
         self._attr_device_info = coordinator.device_info
-        self._is_on: bool | None = None
 
     @property
     def is_on(self) -> bool | None:
-        return self._is_on
+        if self.coordinator.data is None:
+            return None
+        raw = self.coordinator.data.get(self.entity_description.register)
+        return None if raw is None else raw == "on"
 
     async def async_turn_on(self, **kwargs: Any) -> None:
-        await self.coordinator.client.set_register(self.entity_description.register, "on")
-        self._is_on = True
-        self.async_write_ha_state()
+        await self.coordinator.async_write_register(self.entity_description.register, "on")
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         # HTML checkboxes: unchecked = not sent. Send "0" to explicitly disable.
-        await self.coordinator.client.set_register(self.entity_description.register, "0")
-        self._is_on = False
-        self.async_write_ha_state()
+        await self.coordinator.async_write_register(self.entity_description.register, "0")
 
 
 async def async_setup_numbers(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     coordinator: KomfoventCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities(ModeConfigNumber(coordinator, desc) for desc in MODE_NUMBERS)
+    async_add_entities(ModeConfigNumber(coordinator.config, desc) for desc in MODE_NUMBERS)
 
 
 async def async_setup_switches(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     coordinator: KomfoventCoordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_entities(ModeConfigSwitch(coordinator, desc) for desc in MODE_SWITCHES)
+    async_add_entities(ModeConfigSwitch(coordinator.config, desc) for desc in MODE_SWITCHES)
@@ -12,12 +12,12 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from pykomfovent import KomfoventState
 
 from .const import DOMAIN
 from .coordinator import KomfoventCoordinator
+from .entity import KomfoventEntity
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -27,8 +27,7 @@ class KomfoventNumberDescription(NumberEntityDescription):
 
 
 async def _set_supply_temp(coordinator: KomfoventCoordinator, value: float) -> None:
-    await coordinator.client.set_supply_temp(value)
-    await coordinator.async_request_refresh()
+    await coordinator.async_set_supply_temp(value)
 
 
 NUMBERS: tuple[KomfoventNumberDescription, ...] = (
@@ -59,7 +58,7 @@ async def async_setup_entry(
     await async_setup_numbers(hass, entry, async_add_entities)
 
 
-class KomfoventNumber(CoordinatorEntity[KomfoventCoordinator], NumberEntity):
+class KomfoventNumber(KomfoventEntity[KomfoventCoordinator], NumberEntity):
     entity_description: KomfoventNumberDescription
     _attr_has_entity_name = True
 
@@ -68,7 +67,7 @@ class KomfoventNumber(CoordinatorEntity[KomfoventCoordinator], NumberEntity):
         coordinator: KomfoventCoordinator,
         description: KomfoventNumberDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.value_fn)
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.host}_{description.key}"
         self._attr_translation_key = description.translation_key
@@ -0,0 +1,83 @@
+import asyncio
+import heapq
+from collections.abc import Awaitable, Callable
+from enum import IntEnum
+from functools import partial
+from itertools import count
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+
+class RequestPriority(IntEnum):
+    WRITE = 0
+    READ = 1
+    POLL = 2
+
+
+class RequestLane:
+    # The unit's web server copes badly with concurrent requests; send them one at a time,
+    # writes first, then reads in the order they were queued.
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._hass = hass
+        self._busy = False
+        self._queue: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._order = count()
+        self._writes = 0
+        self._reads: dict[str, tuple[int, asyncio.Task[Any]]] = {}
+
+    async def run[T](self, request: Callable[[], Awaitable[T]], priority: RequestPriority) -> T:
+        if priority is RequestPriority.WRITE:
+            self._writes += 1
+        await self._acquire(priority)
+        try:
+            return await request()
+        finally:
+            self._release()
+
+    async def read[T](
+        self,
+        key: str,
+        request: Callable[[], Awaitable[T]],
+        priority: RequestPriority = RequestPriority.READ,
+    ) -> T:
+        # A read of the same kind queued or running since the last write already returns what
+        # this one would; share its result instead of asking the unit again.
+        flight = self._reads.get(key)
+        if flight is None or flight[0] != self._writes:
+            task = self._hass.async_create_task(
+                self.run(request, priority), f"pykomfovent_read_{key}", eager_start=False
+            )
+            flight = self._reads[key] = (self._writes, task)
+            task.add_done_callback(partial(self._read_done, key))
+        return await asyncio.shield(flight[1])
+
+    def _read_done(self, key: str, task: asyncio.Task[Any]) -> None:
+        if (flight := self._reads.get(key)) is not None and flight[1] is task:
+            del self._reads[key]
+
+    async def _acquire(self, priority: RequestPriority) -> None:
+        if not self._busy and not self._queue:
+            self._busy = True
+            return
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        entry = (priority, next(self._order), future)
+        heapq.heappush(self._queue, entry)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if entry in self._queue:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+            elif future.done() and not future.cancelled():
+                # The lane was handed over just before the caller went away
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._queue:
+            _, _, future = heapq.heappop(self._queue)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._busy = False
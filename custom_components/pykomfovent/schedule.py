@@ -1,6 +1,11 @@
+from bisect import bisect_right
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 from enum import IntEnum
 
+WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
 
 class ScheduleMode(IntEnum):
     AWAY = 1
@@ -33,8 +38,7 @@ class ScheduleRow:
 
     @property
     def weekdays(self) -> list[str]:
-        days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        return [days[i] for i in range(7) if self.weekday_mask & (1 << i)]
+        return [WEEKDAYS[i] for i in range(7) if self.weekday_mask & (1 << i)]
 
 
 @dataclass
@@ -48,6 +52,101 @@ ROWS_PER_PROGRAM = 4
 ENTRIES_PER_ROW = 5
 TOTAL_ROWS = PROGRAMS * ROWS_PER_PROGRAM
 TOTAL_ENTRIES = TOTAL_ROWS * ENTRIES_PER_ROW
+DAY_MINUTES = 24 * 60
+WEEK_MINUTES = 7 * DAY_MINUTES
+
+
+def week_minute(when: datetime) -> int:
+    return when.weekday() * DAY_MINUTES + when.hour * 60 + when.minute
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleTimeline:
+    # Mode changes as minutes since Monday 00:00; modes[i] is active from transitions[i] until
+    # the next transition, wrapping around the week. None means no entry covers that time.
+    transitions: tuple[int, ...]
+    modes: tuple[ScheduleMode | None, ...]
+    default: ScheduleMode | None = None
+
+    @classmethod
+    def from_schedule(cls, schedule: Schedule) -> "ScheduleTimeline":
+        table: list[ScheduleMode | None] = [None] * WEEK_MINUTES
+        for row in schedule.rows:
+            for day in range(7):
+                if not row.weekday_mask & (1 << day):
+                    continue
+                for entry in row.entries:
+                    start = day * DAY_MINUTES + entry.start_minutes
+                    stop = day * DAY_MINUTES + entry.stop_minutes
+                    if stop <= start:
+                        # Runs past midnight into the next day
+                        stop += DAY_MINUTES
+                    for minute in range(start, stop):
+                        table[minute % WEEK_MINUTES] = entry.mode
+
+        transitions = [m for m in range(WEEK_MINUTES) if table[m] != table[m - 1]]
+        return cls(
+            transitions=tuple(transitions),
+            modes=tuple(table[m] for m in transitions),
+            default=table[0],
+        )
+
+    def mode_at(self, when: datetime) -> ScheduleMode | None:
+        if not self.transitions:
+            return self.default
+        # Index -1 before the first transition picks the last one, which wraps from last week
+        return self.modes[bisect_right(self.transitions, week_minute(when)) - 1]
+
+    def next_transition(self, when: datetime) -> tuple[datetime, ScheduleMode | None] | None:
+        if not self.transitions:
+            return None
+        minute = week_minute(when)
+        index = bisect_right(self.transitions, minute)
+        target = (
+            self.transitions[index]
+            if index < len(self.transitions)
+            else self.transitions[0] + WEEK_MINUTES
+        )
+        at = when.replace(second=0, microsecond=0) + timedelta(minutes=target - minute)
+        return at, self.modes[index % len(self.modes)]
+
+    @property
+    def runs(self) -> tuple[tuple[int, int, ScheduleMode], ...]:
+        # (start, stop, mode) of each scheduled period in week minutes; stop may exceed
+        # WEEK_MINUTES for a period running from Sunday into Monday
+        if not self.transitions:
+            return ((0, WEEK_MINUTES, self.default),) if self.default is not None else ()
+        count = len(self.transitions)
+        return tuple(
+            (
+                start,
+                self.transitions[i + 1] if i + 1 < count else self.transitions[0] + WEEK_MINUTES,
+                mode,
+            )
+            for i, (start, mode) in enumerate(zip(self.transitions, self.modes, strict=True))
+            if mode is not None
+        )
+
+    def occurrences(
+        self, start: datetime, end: datetime
+    ) -> Iterator[tuple[datetime, datetime, ScheduleMode]]:
+        # Repeat the weekly runs over [start, end) one week at a time; begin a week early to
+        # catch a period carried over from the previous Sunday.
+        runs = self.runs
+        if not runs:
+            return
+        week = start.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(
+            days=start.weekday() + 7
+        )
+        while week < end:
+            for run_start, run_stop, mode in runs:
+                begin = week + timedelta(minutes=run_start)
+                finish = week + timedelta(minutes=run_stop)
+                if begin >= end:
+                    return
+                if finish > start:
+                    yield begin, finish, mode
+            week += timedelta(days=7)
 
 
 def parse_schedule_config(data: dict) -> list[Schedule]:
@@ -90,6 +189,63 @@ def parse_schedule_config(data: dict) -> list[Schedule]:
     return schedules
 
 
+def schedule_registers(data: dict) -> dict[str, int]:
+    # get_schedule() data keyed by register, in the form build_schedule_commands produces
+    registers: dict[str, int] = {}
+    for global_row in range(TOTAL_ROWS):
+        registers[str(700 + global_row)] = data["wmask"][global_row]
+    for global_entry in range(TOTAL_ENTRIES):
+        registers[str(620 + global_entry)] = data["mode"][global_entry]
+        registers[str(300 + global_entry)] = data["start"][global_entry]
+        registers[str(380 + global_entry)] = data["stop"][global_entry]
+    return registers
+
+
+def registers_schedule(registers: dict[str, int]) -> dict:
+    # Inverse of schedule_registers
+    return {
+        "wmask": [registers[str(700 + row)] for row in range(TOTAL_ROWS)],
+        "mode": [registers[str(620 + entry)] for entry in range(TOTAL_ENTRIES)],
+        "start": [registers[str(300 + entry)] for entry in range(TOTAL_ENTRIES)],
+        "stop": [registers[str(380 + entry)] for entry in range(TOTAL_ENTRIES)],
+    }
+
+
+def validate_schedule(schedule: Schedule) -> None:
+    # Sweep the program's entries, expanded onto the week, in start order; an entry starting
+    # before the furthest stop seen so far overlaps that entry.
+    intervals: list[tuple[int, int, int, ScheduleEntry]] = []
+    for row_index, row in enumerate(schedule.rows):
+        for day in range(7):
+            if not row.weekday_mask & (1 << day):
+                continue
+            for entry in row.entries:
+                start = day * DAY_MINUTES + entry.start_minutes
+                stop = day * DAY_MINUTES + entry.stop_minutes
+                if stop <= start:
+                    stop += DAY_MINUTES
+                intervals.append((start, stop, row_index, entry))
+                if stop > WEEK_MINUTES:
+                    intervals.append((0, stop - WEEK_MINUTES, row_index, entry))
+    intervals.sort(key=lambda interval: interval[0])
+
+    furthest: tuple[int, int, int, ScheduleEntry] | None = None
+    for interval in intervals:
+        if furthest is not None and interval[0] < furthest[1]:
+            day = WEEKDAYS[interval[0] // DAY_MINUTES]
+            raise ValueError(
+                f"Program {schedule.program}, {day}: "
+                f"{_format_entry(interval[3])} (row {interval[2]}) overlaps "
+                f"{_format_entry(furthest[3])} (row {furthest[2]})"
+            )
+        if furthest is None or interval[1] > furthest[1]:
+            furthest = interval
+
+
+def _format_entry(entry: ScheduleEntry) -> str:
+    return f"{_format_minutes(entry.start_minutes)}-{_format_minutes(entry.stop_minutes)}"
+
+
 def build_schedule_commands(
     program: int,
     row: int,
@@ -116,3 +272,63 @@ def build_schedule_commands(
         commands[str(380 + global_entry)] = 0
 
     return commands
+
+
+def _format_minutes(minutes: int) -> str:
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _merge_day(
+    day: str, intervals: Sequence[tuple[ScheduleMode, int, int]]
+) -> tuple[tuple[ScheduleMode, int, int], ...]:
+    merged: list[tuple[ScheduleMode, int, int]] = []
+    for mode, start, stop in sorted(intervals, key=lambda interval: interval[1]):
+        # A stop of 00:00 ends the interval at midnight
+        stop = stop or DAY_MINUTES
+        if not 0 <= start < stop <= DAY_MINUTES:
+            raise ValueError(
+                f"{day}: invalid interval {_format_minutes(start)}-{_format_minutes(stop)}"
+            )
+        if merged and start < merged[-1][2]:
+            raise ValueError(
+                f"{day}: {_format_minutes(start)}-{_format_minutes(stop)} overlaps "
+                f"{_format_minutes(merged[-1][1])}-{_format_minutes(merged[-1][2])}"
+            )
+        if merged and merged[-1][0] == mode and merged[-1][2] == start:
+            merged[-1] = (mode, merged[-1][1], stop)
+        else:
+            merged.append((mode, start, stop))
+    if len(merged) > ENTRIES_PER_ROW:
+        raise ValueError(f"{day} needs {len(merged)} entries but a row holds {ENTRIES_PER_ROW}")
+    return tuple(merged)
+
+
+def compile_schedule(
+    program: int, days: Sequence[Sequence[tuple[ScheduleMode, int, int]]]
+) -> dict[str, int]:
+    # days[0] is Monday; each day lists (mode, start, stop) in minutes since midnight. Days with
+    # the same timeline share one row; the result rewrites the whole program.
+    if len(days) != 7:
+        raise ValueError(f"A weekly timeline needs 7 days, got {len(days)}")
+
+    masks: dict[tuple[tuple[ScheduleMode, int, int], ...], int] = {}
+    for day, intervals in enumerate(days):
+        if merged := _merge_day(WEEKDAYS[day], intervals):
+            masks[merged] = masks.get(merged, 0) | (1 << day)
+    if len(masks) > ROWS_PER_PROGRAM:
+        raise ValueError(
+            f"Timeline has {len(masks)} distinct days but a program holds {ROWS_PER_PROGRAM} rows"
+        )
+
+    rows = list(masks.items())
+    commands: dict[str, int] = {}
+    for row in range(ROWS_PER_PROGRAM):
+        weekday_mask, entries = 0, []
+        if row < len(rows):
+            intervals, weekday_mask = rows[row]
+            entries = [
+                (int(mode), start // 60, start % 60, stop // 60, stop % 60)
+                for mode, start, stop in intervals
+            ]
+        commands.update(build_schedule_commands(program, row, weekday_mask, entries))
+    return commands
@@ -4,10 +4,16 @@ from homeassistant.components.select import SelectEntity
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from pykomfovent import KomfoventState
 
 from .const import DOMAIN, MODES
-from .coordinator import KomfoventCoordinator
+from .coordinator import KomfoventCoordinator, mode_key
+from .entity import KomfoventEntity
+
+
+def _mode_option(state: KomfoventState) -> str | None:
+    return mode_key(state.mode)
 
 
 async def async_setup_entry(
@@ -17,14 +23,14 @@ async def async_setup_entry(
     async_add_entities([KomfoventModeSelect(coordinator)])
 
 
-class KomfoventModeSelect(CoordinatorEntity[KomfoventCoordinator], SelectEntity):
+class KomfoventModeSelect(KomfoventEntity[KomfoventCoordinator], SelectEntity):
     _attr_has_entity_name = True
     _attr_translation_key = "mode_select"
     _attr_icon = "mdi:hvac"
     _attr_options: ClassVar[list[str]] = list(MODES.keys())
 
     def __init__(self, coordinator: KomfoventCoordinator) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=_mode_option)
         self._attr_unique_id = f"{coordinator.host}_mode_select"
         self._attr_device_info = coordinator.device_info
 
@@ -32,12 +38,7 @@ class KomfoventModeSelect(CoordinatorEntity[KomfoventCoordinator], SelectEntity)
     def current_option(self) -> str | None:
         if self.coordinator.data is None:
             return None
-        mode = self.coordinator.data.mode.upper()
-        for key, values in MODES.items():
-            if mode in values:
-                return key
-        return None
+        return _mode_option(self.coordinator.data)
 
     async def async_select_option(self, option: str) -> None:
-        await self.coordinator.client.set_mode(option)
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_set_mode(option)
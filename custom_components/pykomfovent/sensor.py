@@ -1,5 +1,6 @@
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
@@ -17,12 +18,14 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.util import dt as dt_util
 
 from pykomfovent import KomfoventState
 
 from .const import DOMAIN
 from .coordinator import KomfoventCoordinator
+from .entity import KomfoventEntity
+from .schedule import ScheduleMode
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -30,6 +33,11 @@ class KomfoventSensorDescription(SensorEntityDescription):
     value_fn: Callable[[KomfoventState], float | str | None]
 
 
+@dataclass(frozen=True, kw_only=True)
+class KomfoventScheduleSensorDescription(SensorEntityDescription):
+    value_fn: Callable[[datetime, ScheduleMode | None], datetime | str]
+
+
 SENSORS: tuple[KomfoventSensorDescription, ...] = (
     KomfoventSensorDescription(
         key="mode",
@@ -287,14 +295,36 @@ SENSORS: tuple[KomfoventSensorDescription, ...] = (
 )
 
 
+SCHEDULE_SENSORS: tuple[KomfoventScheduleSensorDescription, ...] = (
+    KomfoventScheduleSensorDescription(
+        key="next_scheduled_mode",
+        translation_key="next_scheduled_mode",
+        device_class=SensorDeviceClass.ENUM,
+        options=[*(mode.name.lower() for mode in ScheduleMode), "unscheduled"],
+        icon="mdi:calendar-clock",
+        value_fn=lambda _, mode: mode.name.lower() if mode is not None else "unscheduled",
+    ),
+    KomfoventScheduleSensorDescription(
+        key="next_scheduled_change",
+        translation_key="next_scheduled_change",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        icon="mdi:calendar-arrow-right",
+        value_fn=lambda at, _: at,
+    ),
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback
 ) -> None:
     coordinator: KomfoventCoordinator = hass.data[DOMAIN][entry.entry_id]
     async_add_entities(KomfoventSensor(coordinator, description) for description in SENSORS)
+    async_add_entities(
+        KomfoventScheduleSensor(coordinator, description) for description in SCHEDULE_SENSORS
+    )
 
 
-class KomfoventSensor(CoordinatorEntity[KomfoventCoordinator], SensorEntity):
+class KomfoventSensor(KomfoventEntity[KomfoventCoordinator], SensorEntity):
     entity_description: KomfoventSensorDescription
     _attr_has_entity_name = True
 
@@ -303,7 +333,7 @@ class KomfoventSensor(CoordinatorEntity[KomfoventCoordinator], SensorEntity):
         coordinator: KomfoventCoordinator,
         description: KomfoventSensorDescription,
     ) -> None:
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=description.value_fn)
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.host}_{description.key}"
         self._attr_translation_key = description.translation_key
@@ -314,3 +344,34 @@ class KomfoventSensor(CoordinatorEntity[KomfoventCoordinator], SensorEntity):
         if self.coordinator.data is None:
             return None
         return self.entity_description.value_fn(self.coordinator.data)
+
+
+class KomfoventScheduleSensor(SensorEntity):
+    entity_description: KomfoventScheduleSensorDescription
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: KomfoventCoordinator,
+        description: KomfoventScheduleSensorDescription,
+    ) -> None:
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.host}_{description.key}"
+        self._attr_translation_key = description.translation_key
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        # Computed from the cached schedule; the coordinator notifies at each transition
+        self.async_on_remove(
+            self.coordinator.async_add_schedule_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> datetime | str | None:
+        timeline = self.coordinator.timeline
+        upcoming = timeline.next_transition(dt_util.now()) if timeline is not None else None
+        if upcoming is None:
+            return None
+        return self.entity_description.value_fn(*upcoming)
@@ -1,15 +1,39 @@
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+
 import voluptuous as vol
-from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
-from homeassistant.helpers import device_registry as dr
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import JsonValueType
 
-from .const import DOMAIN, MODES
+from .const import (
+    DATA_DEVICE_INDEX,
+    DOMAIN,
+    MAX_PARALLEL_DEVICE_CALLS,
+    MODES,
+    SCHEDULE_CACHE_TTL,
+)
 from .coordinator import KomfoventCoordinator
-from .schedule import build_schedule_commands, parse_schedule_config
+from .mode_config import profile_registers
+from .schedule import (
+    ROWS_PER_PROGRAM,
+    WEEKDAYS,
+    ScheduleMode,
+    build_schedule_commands,
+    compile_schedule,
+)
+
+_LOGGER = logging.getLogger(__name__)
 
 SERVICE_SET_MODE = "set_mode"
 SERVICE_SET_TEMPERATURE = "set_temperature"
 SERVICE_GET_SCHEDULE = "get_schedule"
 SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_SET_SCHEDULES = "set_schedules"
+SERVICE_SET_WEEKLY_SCHEDULE = "set_weekly_schedule"
+SERVICE_APPLY_PROFILE = "apply_profile"
 
 SERVICE_SET_MODE_SCHEMA = vol.Schema(
     {
@@ -25,66 +49,169 @@ SERVICE_SET_TEMPERATURE_SCHEMA = vol.Schema(
     }
 )
 
+SCHEDULE_ENTRY_SCHEMA = vol.Schema(
+    {
+        vol.Required("mode"): vol.In(["away", "normal", "intensive", "boost"]),
+        vol.Required("start"): str,
+        vol.Required("stop"): str,
+    }
+)
+
 SERVICE_SET_SCHEDULE_SCHEMA = vol.Schema(
     {
         vol.Required("program"): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
         vol.Required("row"): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
         vol.Required("weekdays"): vol.All(vol.Coerce(int), vol.Range(min=0, max=127)),
-        vol.Required("entries"): [
-            {
-                vol.Required("mode"): vol.In(["away", "normal", "intensive", "boost"]),
-                vol.Required("start"): str,
-                vol.Required("stop"): str,
-            }
-        ],
+        vol.Required("entries"): [SCHEDULE_ENTRY_SCHEMA],
+        vol.Optional("device_id"): str,
+    }
+)
+
+SERVICE_SET_SCHEDULES_SCHEMA = vol.Schema(
+    {
+        vol.Required("programs"): vol.All(
+            [
+                {
+                    vol.Required("program"): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+                    vol.Required("rows"): vol.All(
+                        [
+                            {
+                                vol.Required("weekdays"): vol.All(
+                                    vol.Coerce(int), vol.Range(min=0, max=127)
+                                ),
+                                vol.Required("entries"): [SCHEDULE_ENTRY_SCHEMA],
+                            }
+                        ],
+                        vol.Length(max=ROWS_PER_PROGRAM),
+                    ),
+                }
+            ],
+            vol.Length(min=1),
+        ),
+        vol.Optional("device_id"): str,
+    }
+)
+
+SERVICE_SET_WEEKLY_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required("program"): vol.All(vol.Coerce(int), vol.Range(min=0, max=3)),
+        vol.Required("days"): {vol.In([d.lower() for d in WEEKDAYS]): [SCHEDULE_ENTRY_SCHEMA]},
         vol.Optional("device_id"): str,
     }
 )
 
 SERVICE_GET_SCHEDULE_SCHEMA = vol.Schema(
     {
+        vol.Optional("max_age", default=SCHEDULE_CACHE_TTL): vol.All(
+            vol.Coerce(float), vol.Range(min=0)
+        ),
+        vol.Optional("device_id"): str,
+    }
+)
+
+SERVICE_APPLY_PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Required("settings"): vol.All({str: vol.Any(bool, int, float, str)}, vol.Length(min=1)),
         vol.Optional("device_id"): str,
     }
 )
 
 
 def _get_coordinators(hass: HomeAssistant, device_id: str | None) -> list[KomfoventCoordinator]:
-    coordinators: list[KomfoventCoordinator] = []
-    for coordinator in hass.data.get(DOMAIN, {}).values():
-        if not isinstance(coordinator, KomfoventCoordinator):
-            continue
-        if device_id is None:
-            coordinators.append(coordinator)
+    if device_id is None:
+        return [
+            coordinator
+            for coordinator in hass.data.get(DOMAIN, {}).values()
+            if isinstance(coordinator, KomfoventCoordinator)
+        ]
+    # Accepts a device registry id or the unit's host
+    coordinator = hass.data.get(DATA_DEVICE_INDEX, {}).get(device_id)
+    return [coordinator] if coordinator is not None else []
+
+
+def _mode_name(mode: ScheduleMode | None) -> str | None:
+    return mode.name.lower() if mode is not None else None
+
+
+def _parse_entries(entries_data: list[dict]) -> list[tuple[int, int, int, int, int]]:
+    mode_map = {"away": 1, "normal": 2, "intensive": 3, "boost": 4}
+    entries = []
+    for e in entries_data:
+        start_parts = e["start"].split(":")
+        stop_parts = e["stop"].split(":")
+        if len(start_parts) != 2 or len(stop_parts) != 2:
+            raise ValueError("Invalid time format. Use HH:MM")
+        start_h, start_m = int(start_parts[0]), int(start_parts[1])
+        stop_h, stop_m = int(stop_parts[0]), int(stop_parts[1])
+        if not (0 <= start_h <= 23 and 0 <= start_m <= 59):
+            raise ValueError(f"Invalid start time: {e['start']}")
+        if not (0 <= stop_h <= 24 and 0 <= stop_m <= 59):
+            raise ValueError(f"Invalid stop time: {e['stop']}")
+        entries.append((mode_map[e["mode"]], start_h, start_m, stop_h, stop_m))
+    return entries
+
+
+async def _async_run_on_devices(
+    coordinators: list[KomfoventCoordinator],
+    action: Callable[[KomfoventCoordinator], Awaitable[None]],
+) -> ServiceResponse:
+    # Devices are handled in parallel so one slow or unreachable unit does not hold up the rest
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_DEVICE_CALLS)
+
+    async def run(coordinator: KomfoventCoordinator) -> None:
+        async with semaphore:
+            await action(coordinator)
+
+    results = await asyncio.gather(*(run(c) for c in coordinators), return_exceptions=True)
+
+    succeeded: list[JsonValueType] = []
+    failed: dict[str, JsonValueType] = {}
+    for coordinator, result in zip(coordinators, results, strict=True):
+        if isinstance(result, Exception):
+            _LOGGER.warning("Komfovent %s failed: %s", coordinator.host, result)
+            failed[coordinator.host] = str(result) or type(result).__name__
+        elif isinstance(result, BaseException):
+            raise result
         else:
-            device_registry = dr.async_get(hass)
-            device = device_registry.async_get(device_id)
-            if device and (DOMAIN, coordinator.host) in device.identifiers:
-                coordinators.append(coordinator)
-    return coordinators
+            succeeded.append(coordinator.host)
+
+    if failed and not succeeded:
+        raise HomeAssistantError(
+            "All devices failed: " + ", ".join(f"{host}: {err}" for host, err in failed.items())
+        )
+    return {"succeeded": succeeded, "failed": failed}
 
 
 async def async_setup_services(hass: HomeAssistant) -> None:
-    async def handle_set_mode(call: ServiceCall) -> None:
+    async def handle_set_mode(call: ServiceCall) -> ServiceResponse:
         mode = call.data["mode"]
         device_id = call.data.get("device_id")
-        for coordinator in _get_coordinators(hass, device_id):
-            await coordinator.client.set_mode(mode)
-            await coordinator.async_request_refresh()
+        return await _async_run_on_devices(
+            _get_coordinators(hass, device_id), lambda c: c.async_set_mode(mode)
+        )
 
-    async def handle_set_temperature(call: ServiceCall) -> None:
+    async def handle_set_temperature(call: ServiceCall) -> ServiceResponse:
         temp = call.data["temperature"]
         device_id = call.data.get("device_id")
-        for coordinator in _get_coordinators(hass, device_id):
-            await coordinator.client.set_supply_temp(temp)
-            await coordinator.async_request_refresh()
+        return await _async_run_on_devices(
+            _get_coordinators(hass, device_id), lambda c: c.async_set_supply_temp(temp)
+        )
 
     async def handle_get_schedule(call: ServiceCall) -> dict:
         device_id = call.data.get("device_id")
         for coordinator in _get_coordinators(hass, device_id):
-            raw = await coordinator.client.get_schedule()
-            schedules = parse_schedule_config(raw)
+            raw, schedules = await coordinator.async_get_schedule(call.data["max_age"])
+            now = dt_util.now()
+            timeline = coordinator.timeline
+            upcoming = timeline.next_transition(now) if timeline else None
             return {
                 "current_program": raw.get("current_program", 0),
+                "active_mode": _mode_name(timeline.mode_at(now)) if timeline else None,
+                "next_change": (
+                    {"at": upcoming[0].isoformat(), "mode": _mode_name(upcoming[1])}
+                    if upcoming
+                    else None
+                ),
                 "schedules": [
                     {
                         "program": s.program,
@@ -109,41 +236,32 @@ async def async_setup_services(hass: HomeAssistant) -> None:
             }
         return {}
 
-    async def handle_set_schedule(call: ServiceCall) -> None:
+    async def handle_set_schedule(call: ServiceCall) -> ServiceResponse:
         program = call.data["program"]
         row = call.data["row"]
         weekdays = call.data["weekdays"]
         entries_data = call.data["entries"]
         device_id = call.data.get("device_id")
 
-        mode_map = {"away": 1, "normal": 2, "intensive": 3, "boost": 4}
-        entries = []
-        for e in entries_data:
-            start_parts = e["start"].split(":")
-            stop_parts = e["stop"].split(":")
-            if len(start_parts) != 2 or len(stop_parts) != 2:
-                raise ValueError("Invalid time format. Use HH:MM")
-            start_h, start_m = int(start_parts[0]), int(start_parts[1])
-            stop_h, stop_m = int(stop_parts[0]), int(stop_parts[1])
-            if not (0 <= start_h <= 23 and 0 <= start_m <= 59):
-                raise ValueError(f"Invalid start time: {e['start']}")
-            if not (0 <= stop_h <= 24 and 0 <= stop_m <= 59):
-                raise ValueError(f"Invalid stop time: {e['stop']}")
-            entries.append((mode_map[e["mode"]], start_h, start_m, stop_h, stop_m))
-
-        commands = build_schedule_commands(program, row, weekdays, entries)
+        commands = build_schedule_commands(program, row, weekdays, _parse_entries(entries_data))
 
-        for coordinator in _get_coordinators(hass, device_id):
-            await coordinator.client.set_schedule(commands)
+        return await _async_run_on_devices(
+            _get_coordinators(hass, device_id), lambda c: c.async_set_schedule(commands)
+        )
 
     hass.services.async_register(
-        DOMAIN, SERVICE_SET_MODE, handle_set_mode, schema=SERVICE_SET_MODE_SCHEMA
+        DOMAIN,
+        SERVICE_SET_MODE,
+        handle_set_mode,
+        schema=SERVICE_SET_MODE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN,
         SERVICE_SET_TEMPERATURE,
         handle_set_temperature,
         schema=SERVICE_SET_TEMPERATURE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
     hass.services.async_register(
         DOMAIN,
@@ -152,8 +270,86 @@ async def async_setup_services(hass: HomeAssistant) -> None:
         schema=SERVICE_GET_SCHEDULE_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+
+    async def handle_set_schedules(call: ServiceCall) -> ServiceResponse:
+        device_id = call.data.get("device_id")
+
+        # Listed rows replace the program in order; rows left out are cleared
+        commands: dict[str, int] = {}
+        for program_data in call.data["programs"]:
+            rows = program_data["rows"]
+            for row in range(ROWS_PER_PROGRAM):
+                weekdays, entries = 0, []
+                if row < len(rows):
+                    weekdays = rows[row]["weekdays"]
+                    entries = _parse_entries(rows[row]["entries"])
+                commands.update(
+                    build_schedule_commands(program_data["program"], row, weekdays, entries)
+                )
+
+        return await _async_run_on_devices(
+            _get_coordinators(hass, device_id), lambda c: c.async_set_schedule(commands)
+        )
+
+    async def handle_set_weekly_schedule(call: ServiceCall) -> ServiceResponse:
+        device_id = call.data.get("device_id")
+
+        days = [
+            [
+                (ScheduleMode(mode), start_h * 60 + start_m, stop_h * 60 + stop_m)
+                for mode, start_h, start_m, stop_h, stop_m in _parse_entries(
+                    call.data["days"].get(day.lower(), [])
+                )
+            ]
+            for day in WEEKDAYS
+        ]
+        try:
+            commands = compile_schedule(call.data["program"], days)
+        except ValueError as err:
+            raise ValueError(f"Schedule does not fit: {err}") from err
+
+        return await _async_run_on_devices(
+            _get_coordinators(hass, device_id), lambda c: c.async_set_schedule(commands)
+        )
+
+    async def handle_apply_profile(call: ServiceCall) -> ServiceResponse:
+        try:
+            registers = profile_registers(call.data["settings"])
+        except (ValueError, vol.Invalid) as err:
+            raise ValueError(f"Invalid profile: {err}") from err
+        device_id = call.data.get("device_id")
+
+        return await _async_run_on_devices(
+            _get_coordinators(hass, device_id), lambda c: c.config.async_write_registers(registers)
+        )
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULE,
+        handle_set_schedule,
+        schema=SERVICE_SET_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULES,
+        handle_set_schedules,
+        schema=SERVICE_SET_SCHEDULES_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
     hass.services.async_register(
-        DOMAIN, SERVICE_SET_SCHEDULE, handle_set_schedule, schema=SERVICE_SET_SCHEDULE_SCHEMA
+        DOMAIN,
+        SERVICE_SET_WEEKLY_SCHEDULE,
+        handle_set_weekly_schedule,
+        schema=SERVICE_SET_WEEKLY_SCHEDULE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_PROFILE,
+        handle_apply_profile,
+        schema=SERVICE_APPLY_PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
     )
 
 
@@ -162,3 +358,6 @@ async def async_unload_services(hass: HomeAssistant) -> None:
     hass.services.async_remove(DOMAIN, SERVICE_SET_TEMPERATURE)
     hass.services.async_remove(DOMAIN, SERVICE_GET_SCHEDULE)
     hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULE)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_SCHEDULES)
+    hass.services.async_remove(DOMAIN, SERVICE_SET_WEEKLY_SCHEDULE)
+    hass.services.async_remove(DOMAIN, SERVICE_APPLY_PROFILE)
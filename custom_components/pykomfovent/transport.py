@@ -0,0 +1,119 @@
+import hashlib
+import re
+from functools import partial
+
+from pykomfovent import KomfoventClient, KomfoventConnectionError, KomfoventState
+from pykomfovent.parser import KomfoventParseError, parse_state
+
+from .request_lane import RequestLane, RequestPriority
+
+MAIN_PATH = "/i.asp"
+DETAIL_PATH = "/det.asp"
+# Mode, ECO and AUTO settings pages of the web interface
+CONFIG_PATHS = ("/c_cfg.html", "/c_cfg2.html")
+
+_INPUT_PATTERN = re.compile(r"<input\b([^>]*)>", re.IGNORECASE)
+_ATTR_PATTERN = re.compile(r"""([\w-]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?""")
+
+
+def _digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+def parse_config_registers(page: bytes) -> dict[int, str]:
+    # Form fields are named after the register they write; checkboxes report "on"/"0" just
+    # like the values written by set_register.
+    registers: dict[int, str] = {}
+    for tag in _INPUT_PATTERN.finditer(page.decode("windows-1250", errors="ignore")):
+        attrs = {
+            m.group(1).lower(): m.group(2) or m.group(3) or m.group(4) or ""
+            for m in _ATTR_PATTERN.finditer(tag.group(1))
+        }
+        name = attrs.get("name", "")
+        if not name.isdigit():
+            continue
+        if attrs.get("type", "").lower() == "checkbox":
+            registers[int(name)] = "on" if "checked" in attrs else "0"
+        else:
+            registers[int(name)] = attrs.get("value", "").strip()
+    return registers
+
+
+# Raw page fetches go through KomfoventClient._request and pykomfovent.parser, which are not
+# public API; the manifest pins pykomfovent below 1.1 so a library release cannot break them.
+class KomfoventTransport:
+    def __init__(self, client: KomfoventClient, lane: RequestLane) -> None:
+        self.client = client
+        self.lane = lane
+        self.payload_hits = 0
+        self.payload_misses = 0
+        self._digests: tuple[bytes, bytes] | None = None
+        self._state: KomfoventState | None = None
+        self._detail_xml: bytes | None = None
+
+    @property
+    def payload_hit_rate(self) -> float:
+        total = self.payload_hits + self.payload_misses
+        return self.payload_hits / total if total else 0.0
+
+    async def get_state(self, refresh_detail: bool = True) -> KomfoventState:
+        return await self.lane.read(
+            "state", partial(self._get_state, refresh_detail), RequestPriority.POLL
+        )
+
+    async def _get_state(self, refresh_detail: bool) -> KomfoventState:
+        # i.asp carries mode, temperatures, fans and counters; det.asp only the slow-moving
+        # fan intensity and heater/exchanger levels, so the latter may be served from the
+        # previous fetch.
+        main_xml = await self.client._request(MAIN_PATH)
+        if refresh_detail or self._detail_xml is None:
+            self._detail_xml = await self.client._request(DETAIL_PATH)
+        detail_xml = self._detail_xml
+
+        # The unit often serves byte-identical XML between polls; skip parsing in that case and
+        # hand back the very same state object so the coordinator sees no change.
+        digests = (_digest(main_xml), _digest(detail_xml))
+        if self._state is not None and digests == self._digests:
+            self.payload_hits += 1
+            return self._state
+
+        self.payload_misses += 1
+        try:
+            state = parse_state(main_xml, detail_xml)
+        except KomfoventParseError as err:
+            raise KomfoventConnectionError(f"Failed to parse response: {err}") from err
+
+        self._digests = digests
+        self._state = state
+        return state
+
+    async def get_config_registers(self) -> dict[int, str]:
+        return await self.lane.read("config", self._get_config_registers)
+
+    async def _get_config_registers(self) -> dict[int, str]:
+        registers: dict[int, str] = {}
+        for path in CONFIG_PATHS:
+            registers.update(parse_config_registers(await self.client._request(path)))
+        return registers
+
+    async def get_schedule(self) -> dict[str, list[int]]:
+        return await self.lane.read("schedule", self.client.get_schedule)
+
+    async def set_registers(self, registers: dict[int, str]) -> None:
+        await self.lane.run(
+            partial(
+                self.client._request,
+                "/",
+                {str(register): value for register, value in registers.items()},
+            ),
+            RequestPriority.WRITE,
+        )
+
+    async def set_mode(self, mode: str) -> None:
+        await self.lane.run(partial(self.client.set_mode, mode), RequestPriority.WRITE)
+
+    async def set_supply_temp(self, value: float) -> None:
+        await self.lane.run(partial(self.client.set_supply_temp, value), RequestPriority.WRITE)
+
+    async def set_schedule(self, commands: dict[str, int]) -> None:
+        await self.lane.run(partial(self.client.set_schedule, commands), RequestPriority.WRITE)
@@ -0,0 +1,84 @@
+import asyncio
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from pykomfovent import KomfoventConnectionError
+
+from .const import WRITE_COALESCE_WINDOW
+from .transport import KomfoventTransport
+
+
+class RegisterWriteQueue:
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        transport: KomfoventTransport,
+        window: float = WRITE_COALESCE_WINDOW,
+    ) -> None:
+        self._hass = hass
+        self._entry = entry
+        self._transport = transport
+        self._window = window
+        self._pending: dict[int, str] = {}
+        self._waiters: list[asyncio.Future[None]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._flush_task: asyncio.Task[None] | None = None
+
+    async def write(self, registers: dict[int, str]) -> None:
+        # Writes arriving within the window share one request; a register written twice keeps
+        # the last value.
+        self._pending.update(registers)
+        future: asyncio.Future[None] = self._hass.loop.create_future()
+        self._waiters.append(future)
+        if self._flush_handle is None:
+            self._flush_handle = self._hass.loop.call_later(self._window, self._schedule_flush)
+        await future
+
+    async def async_flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        # A flush started by the timer may still be waiting for the lane
+        if self._flush_task is not None:
+            await asyncio.wait([self._flush_task])
+        await self._flush()
+
+    @callback
+    def _schedule_flush(self) -> None:
+        self._flush_handle = None
+        task = self._entry.async_create_background_task(
+            self._hass, self._flush(), "pykomfovent_register_write"
+        )
+        self._flush_task = task
+        task.add_done_callback(self._flush_done)
+
+    @callback
+    def _flush_done(self, task: asyncio.Task[None]) -> None:
+        if self._flush_task is task:
+            self._flush_task = None
+
+    async def _flush(self) -> None:
+        registers, waiters = self._pending, self._waiters
+        self._pending, self._waiters = {}, []
+        if not registers:
+            return
+        try:
+            await self._transport.set_registers(registers)
+        except Exception as err:
+            _fail(waiters, err)
+        except BaseException:
+            # Callers must not wait forever on a cancelled flush
+            _fail(waiters, KomfoventConnectionError("Register write was cancelled"))
+            raise
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+
+def _fail(waiters: list[asyncio.Future[None]], err: Exception) -> None:
+    for waiter in waiters:
+        if not waiter.done():
+            waiter.set_exception(err)
@@ -63,8 +63,95 @@ def mock_state() -> KomfoventState:
     )
 
 
+MAIN_XML = b"""<?xml version="1.0"?>
+<A>
+    <OMO>NORMALNY</OMO>
+    <AI0>21.5</AI0>
+    <AI1>23.0</AI1>
+    <AI2>5.0</AI2>
+    <ST>21.0</ST>
+    <SAF>50</SAF>
+    <EAF>50</EAF>
+    <FCG>47</FCG>
+    <VF>0</VF>
+    <EC1>85</EC1>
+    <EC2>300</EC2>
+    <EC3>55</EC3>
+    <EC4>0</EC4>
+    <EC5A>0.4</EC5A>
+    <EC5D>0.35</EC5D>
+    <EC6D>1.5</EC6D>
+    <EC6M>40.0</EC6M>
+    <EC6T>200.0</EC6T>
+    <EC7D>0.0</EC7D>
+    <EC7M>0.0</EC7M>
+    <EC7T>0.0</EC7T>
+    <EC8D>5.0</EC8D>
+    <EC8M>150.0</EC8M>
+    <EC8T>1200.0</EC8T>
+    <AQ>22</AQ>
+    <AH>45</AH>
+</A>"""
+
+DETAIL_XML = b"""<?xml version="1.0"?>
+<A>
+    <SFI>50</SFI>
+    <EFI>50</EFI>
+    <HE>10</HE>
+    <EH>0</EH>
+</A>"""
+
+
+CONFIG_HTML = b"""<html><body><form method="post" action="/">
+    <input type="text" name="247" value="40">
+    <input type="text" name="248" value="60">
+    <input type="text" name="263" value="215">
+    <input type="checkbox" name="271" checked>
+    <input type="checkbox" name="272">
+    <input type="submit" value="Save">
+</form></body></html>"""
+
+CONFIG2_HTML = b"""<html><body><form method="post" action="/">
+    <input type="text" name="245" value="150">
+    <input type="checkbox" name="242" checked>
+</form></body></html>"""
+
+
+@pytest.fixture
+def device_payloads() -> dict[str, bytes]:
+    # Raw responses matching mock_state, keyed by request path
+    return {
+        "/i.asp": MAIN_XML,
+        "/det.asp": DETAIL_XML,
+        "/c_cfg.html": CONFIG_HTML,
+        "/c_cfg2.html": CONFIG2_HTML,
+    }
+
+
+@pytest.fixture
+def schedule_config() -> dict:
+    # client.get_schedule() result: program 0, row 0 runs NORMAL 08:00-18:00 every day
+    return {
+        "current_program": 0,
+        "wmask": [127] + [0] * 15,
+        "mode": [2] + [1] * 79,
+        "start": [480] + [0] * 79,
+        "stop": [1080] + [0] * 79,
+    }
+
+
+def make_request_mock(payloads: dict[str, bytes]) -> AsyncMock:
+    async def request(path: str, extra_data: dict[str, str] | None = None) -> bytes:
+        # Writes post form data; their response body is not used
+        return payloads[path] if extra_data is None else b""
+
+    return AsyncMock(side_effect=request)
+
+
 @pytest.fixture
-def mock_client(mock_state: KomfoventState) -> Generator[AsyncMock]:
+def mock_client(
+    mock_state: KomfoventState, device_payloads: dict[str, bytes], schedule_config: dict
+) -> Generator[AsyncMock]:
     with (
         patch("custom_components.pykomfovent.config_flow.KomfoventClient") as mock_client_class,
         patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_coord_client,
@@ -72,6 +159,8 @@ def mock_client(mock_state: KomfoventState) -> Generator[AsyncMock]:
         client = AsyncMock()
         client.authenticate = AsyncMock(return_value=True)
         client.get_state = AsyncMock(return_value=mock_state)
+        client._request = make_request_mock(device_payloads)
+        client.get_schedule = AsyncMock(return_value=schedule_config)
         client.set_mode = AsyncMock()
         client.set_supply_temp = AsyncMock()
         client.close = AsyncMock()
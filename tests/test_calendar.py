@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.pykomfovent.calendar import async_setup_entry
+from custom_components.pykomfovent.const import DOMAIN
+from custom_components.pykomfovent.schedule import ScheduleTimeline, parse_schedule_config
+from tests.conftest import make_add_entities
+
+
+async def _setup(hass: HomeAssistant, timelines: tuple[ScheduleTimeline, ...]) -> list:
+    coordinator = MagicMock()
+    coordinator.host = "192.168.0.137"
+    coordinator.device_info = {}
+    coordinator.timelines = timelines
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    entities = []
+    await async_setup_entry(hass, entry, make_add_entities(entities))
+    return entities
+
+
+async def test_calendar_setup(hass: HomeAssistant) -> None:
+    entities = await _setup(hass, ())
+
+    assert len(entities) == 4
+    assert entities[0].unique_id == "192.168.0.137_schedule_program_0"
+    assert entities[3].translation_placeholders == {"program": "4"}
+    # Polls only reach the calendars when availability changes
+    context = entities[0].coordinator_context
+    assert callable(context)
+    assert context(MagicMock(mode="NORMAL")) == context(MagicMock(mode="TURBO"))
+    assert entities[0].event is None
+    events = await entities[0].async_get_events(
+        hass, dt_util.now(), dt_util.now() + timedelta(days=7)
+    )
+    assert events == []
+
+
+async def test_calendar_events(
+    hass: HomeAssistant, schedule_config: dict, freezer: FrozenDateTimeFactory
+) -> None:
+    freezer.move_to("2026-10-14 19:00:00+00:00")  # Wednesday 12:00 US/Pacific
+    timelines = tuple(
+        ScheduleTimeline.from_schedule(s) for s in parse_schedule_config(schedule_config)
+    )
+    entities = await _setup(hass, timelines)
+    tz = dt_util.get_default_time_zone()
+
+    event = entities[0].event
+    assert event is not None
+    assert event.summary == "Normal"
+    assert event.start == datetime(2026, 10, 14, 8, 0, tzinfo=tz)
+    assert event.end == datetime(2026, 10, 14, 18, 0, tzinfo=tz)
+
+    # A year of events is generated from the weekly template without touching the device
+    events = await entities[0].async_get_events(
+        hass, datetime(2026, 1, 1, tzinfo=tz), datetime(2027, 1, 1, tzinfo=tz)
+    )
+    assert len(events) == 365
+    assert events[0].start == datetime(2026, 1, 1, 8, 0, tzinfo=tz)
+    # Across the DST change the events stay at 08:00 local time
+    assert events[-1].start == datetime(2026, 12, 31, 8, 0, tzinfo=tz)
+    assert events[-1].end.utcoffset() != events[100].end.utcoffset()
+
+    assert entities[1].event is None
@@ -9,9 +9,12 @@ from pykomfovent import (
 )
 
 from custom_components.pykomfovent.const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_BACKGROUND_SETUP,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
     CONF_USERNAME,
     DOMAIN,
 )
@@ -318,8 +321,11 @@ async def test_options_flow(hass: HomeAssistant, mock_client: AsyncMock) -> None
 
         result = await flow.async_step_init()
         assert result["type"] == FlowResultType.FORM
+        assert CONF_SLOW_SCAN_INTERVAL in result["data_schema"].schema
+        assert CONF_ADAPTIVE_POLLING in result["data_schema"].schema
+        assert CONF_BACKGROUND_SETUP in result["data_schema"].schema
 
-        result = await flow.async_step_init({CONF_SCAN_INTERVAL: 60})
+        result = await flow.async_step_init({CONF_SCAN_INTERVAL: 60, CONF_SLOW_SCAN_INTERVAL: 600})
         assert result["type"] == FlowResultType.CREATE_ENTRY
 
 
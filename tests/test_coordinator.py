@@ -1,25 +1,46 @@
+import asyncio
+from dataclasses import asdict, replace
+from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
 from pykomfovent import (
     KomfoventAuthError,
     KomfoventConnectionError,
     KomfoventState,
 )
+from pykomfovent.parser import parse_state
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
 
 from custom_components.pykomfovent.const import (
+    CONF_ADAPTIVE_POLLING,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
     CONF_USERNAME,
     DOMAIN,
+    MAX_SCAN_INTERVAL,
+    WRITE_CONFIRM_DELAY,
 )
 from custom_components.pykomfovent.coordinator import KomfoventCoordinator
+from custom_components.pykomfovent.schedule import (
+    build_schedule_commands,
+    parse_schedule_config,
+    registers_schedule,
+    schedule_registers,
+)
+from tests.conftest import make_request_mock
 
 
-async def test_coordinator_update_success(hass: HomeAssistant, mock_state: KomfoventState) -> None:
+async def test_coordinator_update_success(
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
+) -> None:
     entry = MagicMock()
     entry.data = {
         CONF_HOST: "192.168.0.137",
@@ -30,7 +51,7 @@ async def test_coordinator_update_success(hass: HomeAssistant, mock_state: Komfo
 
     with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
         client = AsyncMock()
-        client.get_state = AsyncMock(return_value=mock_state)
+        client._request = make_request_mock(device_payloads)
         mock_client_class.return_value = client
 
         coordinator = KomfoventCoordinator(hass, entry)
@@ -51,7 +72,7 @@ async def test_coordinator_update_connection_error(hass: HomeAssistant) -> None:
 
     with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
         client = AsyncMock()
-        client.get_state = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+        client._request = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
         mock_client_class.return_value = client
 
         coordinator = KomfoventCoordinator(hass, entry)
@@ -60,6 +81,87 @@ async def test_coordinator_update_connection_error(hass: HomeAssistant) -> None:
             await coordinator._async_update_data()
 
 
+async def test_coordinator_backoff_on_connection_errors(
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        for failures, floor, ceiling in (
+            (1, 30, 45),
+            (2, 60, 90),
+            (3, 120, 180),
+            (4, 240, 300),
+            (5, 300, 300),
+            (40, 300, 300),
+        ):
+            coordinator.failures = failures - 1
+            with pytest.raises(UpdateFailed) as exc_info:
+                await coordinator._async_update_data()
+            assert coordinator.failures == failures
+            assert floor <= exc_info.value.retry_after <= ceiling
+            assert coordinator.retry_after == exc_info.value.retry_after
+
+        client._request = make_request_mock(device_payloads)
+        await coordinator._async_update_data()
+        assert coordinator.failures == 0
+        assert coordinator.retry_after is None
+
+
+async def test_coordinator_staggers_poll_phases(hass: HomeAssistant) -> None:
+    coordinators = []
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient"):
+        for entry_id in ("a", "b", "c"):
+            entry = MagicMock()
+            entry.entry_id = entry_id
+            entry.pref_disable_polling = False
+            entry.data = {
+                CONF_HOST: "192.168.0.137",
+                CONF_USERNAME: "user",
+                CONF_PASSWORD: "pass",
+                CONF_SCAN_INTERVAL: 30,
+            }
+            coordinators.append(KomfoventCoordinator(hass, entry))
+    hass.data[DOMAIN] = {c.config_entry.entry_id: c for c in coordinators[:2]}
+
+    def scheduled_at(coordinator: KomfoventCoordinator, now: float) -> float:
+        coordinator._microsecond = 0
+        with (
+            patch.object(hass.loop, "time", return_value=now),
+            patch.object(hass.loop, "call_at") as call_at,
+        ):
+            coordinator._schedule_refresh()
+        assert coordinator.update_interval == timedelta(seconds=30)
+        return call_at.call_args[0][0]
+
+    # Two entries poll half an interval apart, each on a fixed slot
+    assert scheduled_at(coordinators[0], 1000) == 1020
+    assert scheduled_at(coordinators[0], 1020.5) == 1050
+    assert scheduled_at(coordinators[1], 1000) == 1035
+    assert scheduled_at(coordinators[1], 1036) == 1065
+
+    # A third entry shifts the slots to thirds of the interval
+    hass.data[DOMAIN]["c"] = coordinators[2]
+    assert scheduled_at(coordinators[1], 1000) == 1030
+    assert scheduled_at(coordinators[2], 1000) == 1040
+
+    # Retries after failures keep their backoff instead of waiting for the slot
+    coordinators[0].failures = 1
+    assert scheduled_at(coordinators[0], 1000) == 1030
+
+
 async def test_coordinator_update_auth_error(hass: HomeAssistant) -> None:
     entry = MagicMock()
     entry.data = {
@@ -71,7 +173,7 @@ async def test_coordinator_update_auth_error(hass: HomeAssistant) -> None:
 
     with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
         client = AsyncMock()
-        client.get_state = AsyncMock(side_effect=KomfoventAuthError("Auth failed"))
+        client._request = AsyncMock(side_effect=KomfoventAuthError("Auth failed"))
         mock_client_class.return_value = client
 
         coordinator = KomfoventCoordinator(hass, entry)
@@ -109,7 +211,7 @@ async def test_coordinator_unavailable_logging(hass: HomeAssistant) -> None:
 
     with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
         client = AsyncMock()
-        client.get_state = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+        client._request = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
         mock_client_class.return_value = client
 
         coordinator = KomfoventCoordinator(hass, entry)
@@ -126,7 +228,7 @@ async def test_coordinator_unavailable_logging(hass: HomeAssistant) -> None:
 
 
 async def test_coordinator_connection_restored(
-    hass: HomeAssistant, mock_state: KomfoventState
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
 ) -> None:
     entry = MagicMock()
     entry.data = {
@@ -144,8 +246,768 @@ async def test_coordinator_connection_restored(
         coordinator._unavailable_logged = True
 
         # Connection restored
-        client.get_state = AsyncMock(return_value=mock_state)
+        client._request = make_request_mock(device_payloads)
         data = await coordinator._async_update_data()
 
         assert coordinator._unavailable_logged is False
         assert data.mode == "NORMALNY"
+
+
+async def test_coordinator_notifies_only_changed_listeners(
+    hass: HomeAssistant, mock_state: KomfoventState
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient"):
+        coordinator = KomfoventCoordinator(hass, entry)
+
+    supply_listener = MagicMock()
+    outdoor_listener = MagicMock()
+    plain_listener = MagicMock()
+    unsubs = [
+        coordinator.async_add_listener(supply_listener, lambda s: s.supply_temp),
+        coordinator.async_add_listener(outdoor_listener, lambda s: s.outdoor_temp),
+        coordinator.async_add_listener(plain_listener),
+    ]
+
+    # First snapshot notifies everyone
+    coordinator.async_set_updated_data(mock_state)
+    assert supply_listener.call_count == 1
+    assert outdoor_listener.call_count == 1
+    assert plain_listener.call_count == 1
+
+    # Only supply temperature changed
+    coordinator.async_set_updated_data(replace(mock_state, supply_temp=22.0))
+    assert supply_listener.call_count == 2
+    assert outdoor_listener.call_count == 1
+    assert plain_listener.call_count == 2
+
+    # Availability change notifies everyone
+    coordinator.last_update_success = False
+    coordinator.async_update_listeners()
+    assert supply_listener.call_count == 3
+    assert outdoor_listener.call_count == 2
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_coordinator_skips_parse_for_identical_payload(
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with (
+        patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class,
+        patch(
+            "custom_components.pykomfovent.transport.parse_state", wraps=parse_state
+        ) as mock_parse,
+    ):
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        first = await coordinator._async_update_data()
+        second = await coordinator._async_update_data()
+
+        assert second is first
+        assert mock_parse.call_count == 1
+        assert coordinator.transport.payload_hits == 1
+        assert coordinator.transport.payload_misses == 1
+        assert coordinator.transport.payload_hit_rate == 0.5
+
+        # A changed payload is parsed again
+        device_payloads["/i.asp"] = device_payloads["/i.asp"].replace(b"21.5", b"22.5")
+        third = await coordinator._async_update_data()
+
+        assert third.supply_temp == 22.5
+        assert mock_parse.call_count == 2
+
+
+async def test_coordinator_parse_error(hass: HomeAssistant) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = AsyncMock(return_value=b"<broken")
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+
+async def test_coordinator_fetches_detail_on_slow_tier(
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 10,
+        CONF_SLOW_SCAN_INTERVAL: 300,
+    }
+
+    with (
+        patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class,
+        patch("custom_components.pykomfovent.coordinator.monotonic") as mock_monotonic,
+    ):
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        mock_monotonic.return_value = 1000.0
+        await coordinator._async_update_data()
+        assert [c.args[0] for c in client._request.call_args_list] == ["/i.asp", "/det.asp"]
+
+        # Fast tier only
+        client._request.reset_mock()
+        mock_monotonic.return_value = 1010.0
+        data = await coordinator._async_update_data()
+        assert [c.args[0] for c in client._request.call_args_list] == ["/i.asp"]
+        assert data.heat_exchanger_percent == 10.0
+
+        # Slow tier due again
+        client._request.reset_mock()
+        mock_monotonic.return_value = 1300.0
+        await coordinator._async_update_data()
+        assert [c.args[0] for c in client._request.call_args_list] == ["/i.asp", "/det.asp"]
+
+
+async def test_coordinator_adaptive_interval(
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 10,
+        CONF_ADAPTIVE_POLLING: True,
+    }
+
+    with (
+        patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class,
+        patch("custom_components.pykomfovent.coordinator.monotonic") as mock_monotonic,
+    ):
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        async def poll(at: float) -> float:
+            mock_monotonic.return_value = at
+            coordinator.data = await coordinator._async_update_data()
+            return coordinator.update_interval.total_seconds()
+
+        assert await poll(0) == 10
+        # Stable snapshots back off
+        assert await poll(10) == 15
+        assert await poll(25) == 22.5
+
+        # Fast temperature slope snaps back to the configured interval
+        device_payloads["/i.asp"] = device_payloads["/i.asp"].replace(b"21.5", b"25.5")
+        assert await poll(47.5) == 10
+
+        # Back-off never exceeds the maximum
+        for i in range(20):
+            interval = await poll(100 + i * 300)
+        assert interval == MAX_SCAN_INTERVAL
+
+        # Mode change is volatile
+        device_payloads["/i.asp"] = device_payloads["/i.asp"].replace(b"NORMALNY", b"TURBO")
+        assert await poll(7000) == 10
+        assert await poll(7010) == 15
+
+        # A write confirmed by the next poll is a change, even though the optimistic state
+        # already shows it
+        client.set_mode = AsyncMock()
+        with patch.object(coordinator, "async_request_refresh"):
+            await coordinator.async_set_mode("intensive")
+        device_payloads["/i.asp"] = device_payloads["/i.asp"].replace(b"TURBO", b"INTENSYWNY")
+        assert await poll(7025) == 10
+
+
+async def test_coordinator_refresh_request_resets_adaptive_interval(hass: HomeAssistant) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 10,
+        CONF_ADAPTIVE_POLLING: True,
+    }
+
+    with (
+        patch("custom_components.pykomfovent.coordinator.KomfoventClient"),
+        patch(
+            "homeassistant.helpers.update_coordinator.DataUpdateCoordinator.async_request_refresh"
+        ) as mock_refresh,
+    ):
+        coordinator = KomfoventCoordinator(hass, entry)
+        coordinator.update_interval = timedelta(seconds=MAX_SCAN_INTERVAL)
+
+        await coordinator.async_request_refresh()
+
+        assert coordinator.update_interval == timedelta(seconds=10)
+        mock_refresh.assert_called_once()
+
+
+async def test_coordinator_write_through(
+    hass: HomeAssistant, mock_state: KomfoventState, caplog: pytest.LogCaptureFixture
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        coordinator.data = mock_state
+        coordinator.async_request_refresh = AsyncMock()
+        listener = MagicMock()
+        unsub = coordinator.async_add_listener(listener)
+
+        # Optimistic values are visible as soon as the write returns, in the device language
+        coordinator._detail_refreshed_at = 0.0
+        await coordinator.async_set_mode("intensive")
+        client.set_mode.assert_called_once_with("intensive")
+        assert coordinator.data.mode == "INTENSYWNY"
+        coordinator.async_request_refresh.assert_called_once()
+        # The confirming poll re-reads the detail page as well
+        assert coordinator._detail_refreshed_at is None
+
+        await coordinator.async_set_supply_temp(23.0)
+        client.set_supply_temp.assert_called_once_with(23.0)
+        assert coordinator.data.supply_temp_setpoint == 23.0
+        assert listener.call_count == 2
+
+        # The confirming poll shows the device only applied the mode
+        coordinator.data = replace(mock_state, mode="INTENSYWNY")
+        coordinator._async_refresh_finished()
+        assert "did not apply supply_temp_setpoint" in caplog.text
+        assert coordinator._unconfirmed == {}
+
+        unsub()
+
+
+async def test_coordinator_write_through_rollback_on_error(
+    hass: HomeAssistant, mock_state: KomfoventState
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client.set_mode = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        coordinator.data = mock_state
+        coordinator._detail_refreshed_at = 0.0
+        coordinator.async_request_refresh = AsyncMock()
+
+        with pytest.raises(KomfoventConnectionError):
+            await coordinator.async_set_mode("boost")
+
+        assert coordinator.data is mock_state
+        assert coordinator.last_update_success
+        assert coordinator._detail_refreshed_at == 0.0
+        coordinator.async_request_refresh.assert_not_called()
+
+        # An unreachable unit keeps its last data and stays unavailable
+        coordinator.last_update_success = False
+        listener = MagicMock()
+        coordinator.async_add_listener(listener)
+        with pytest.raises(KomfoventConnectionError):
+            await coordinator.async_set_mode("boost")
+
+        assert coordinator.data is mock_state
+        assert not coordinator.last_update_success
+        listener.assert_not_called()
+
+
+async def test_coordinator_schedule_cache(hass: HomeAssistant, schedule_config: dict) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    entry.async_create_background_task.side_effect = (
+        lambda hass, target, name: hass.async_create_background_task(target, name)
+    )
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client.get_schedule = AsyncMock(return_value=schedule_config)
+        client.set_schedule = AsyncMock(side_effect=[None, KomfoventConnectionError("failed")])
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        raw, schedules = await coordinator.async_get_schedule()
+        assert raw is schedule_config
+        assert schedules[0].rows[0].entries[0].start_hour == 8
+        assert coordinator.timeline is not None
+        assert coordinator.timeline.transitions[:2] == (480, 1080)
+        assert await coordinator.async_get_schedule() == (raw, schedules)
+        assert client.get_schedule.call_count == 1
+
+        await coordinator.async_get_schedule(max_age=0)
+        assert client.get_schedule.call_count == 2
+
+        # Writes diff against a fresh read, then re-read what the unit reports
+        await coordinator.async_set_schedule({"700": 1})
+        await hass.async_block_till_done()
+        assert client.get_schedule.call_count == 4
+        await coordinator.async_get_schedule()
+        assert client.get_schedule.call_count == 4
+
+        with pytest.raises(KomfoventConnectionError):
+            await coordinator.async_set_schedule({"700": 1})
+        await hass.async_block_till_done()
+        assert client.get_schedule.call_count == 6
+
+
+async def test_coordinator_shares_concurrent_reads(
+    hass: HomeAssistant,
+    device_payloads: dict[str, bytes],
+    schedule_config: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        client.get_schedule = AsyncMock(return_value=schedule_config)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        with patch(
+            "custom_components.pykomfovent.coordinator.parse_schedule_config",
+            wraps=parse_schedule_config,
+        ) as parse:
+            results = await asyncio.gather(
+                *(coordinator.async_get_schedule(max_age=0) for _ in range(5))
+            )
+        assert all(result == results[0] for result in results)
+        client.get_schedule.assert_called_once()
+        parse.assert_called_once()
+
+        await coordinator.async_refresh()
+        assert client._request.call_count == 2
+        await asyncio.gather(*(coordinator.async_request_refresh() for _ in range(5)))
+        freezer.tick(timedelta(seconds=WRITE_CONFIRM_DELAY + 1))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert client._request.call_count == 3
+
+
+async def test_coordinator_refreshes_at_schedule_transitions(
+    hass: HomeAssistant, schedule_config: dict, freezer: FrozenDateTimeFactory
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    freezer.move_to("2026-10-14 19:00:00+00:00")  # Wednesday 12:00 US/Pacific
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client.get_schedule = AsyncMock(
+            side_effect=[
+                schedule_config,
+                schedule_config,
+                KomfoventConnectionError,
+                schedule_config,
+            ]
+        )
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        coordinator.async_request_refresh = AsyncMock()
+        listener = MagicMock()
+        remove_listener = coordinator.async_add_schedule_listener(listener)
+        await coordinator.async_refresh_schedule()
+        assert listener.call_count == 1
+
+        # Normal mode ends at 18:00: schedule entities update right away, the poll follows
+        freezer.move_to("2026-10-15 01:00:00+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert listener.call_count == 2
+        coordinator.async_request_refresh.assert_not_called()
+
+        # Re-reading the schedule re-arms the next transition but keeps the pending poll
+        await coordinator.async_refresh_schedule()
+        freezer.move_to("2026-10-15 01:00:10+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        coordinator.async_request_refresh.assert_called_once()
+
+        # The schedule read failed but the timeline is kept and re-armed for 08:00
+        remove_listener()
+        freezer.move_to("2026-10-15 15:00:00+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        freezer.move_to("2026-10-15 15:00:10+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert coordinator.async_request_refresh.call_count == 2
+        assert client.get_schedule.call_count == 4
+        assert listener.call_count == 2
+
+        # Shutdown also cancels a follow-up poll that is still pending
+        coordinator._async_handle_transition(dt_util.now())
+        coordinator._async_handle_transition(dt_util.now())
+        await coordinator.async_shutdown()
+        freezer.move_to("2026-10-16 01:00:10+00:00")
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert coordinator.async_request_refresh.call_count == 2
+
+        # A schedule read finishing after shutdown does not re-arm the timer
+        coordinator._arm_transition_refresh()
+        assert coordinator._unsub_transition is None
+
+
+async def test_coordinator_set_schedule_writes_changes_only(
+    hass: HomeAssistant, schedule_config: dict
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    entry.async_create_background_task.side_effect = (
+        lambda hass, target, name: hass.async_create_background_task(target, name)
+    )
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client.get_schedule = AsyncMock(return_value=schedule_config)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        await coordinator.async_set_schedule(build_schedule_commands(0, 0, 127, [(2, 8, 0, 18, 0)]))
+        client.set_schedule.assert_not_called()
+        assert client.get_schedule.call_count == 1
+
+        await coordinator.async_set_schedule(
+            build_schedule_commands(0, 0, 31, [(2, 8, 0, 18, 0), (1, 22, 0, 23, 0)])
+        )
+        client.set_schedule.assert_called_once_with({"700": 31, "301": 1320, "381": 1380})
+
+
+async def test_coordinator_set_schedule_serializes_writes(
+    hass: HomeAssistant, schedule_config: dict
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    entry.async_create_background_task.side_effect = (
+        lambda hass, target, name: hass.async_create_background_task(target, name)
+    )
+    registers = schedule_registers(schedule_config)
+
+    async def get_schedule() -> dict:
+        return registers_schedule(registers)
+
+    async def set_schedule(commands: dict[str, int]) -> None:
+        await asyncio.sleep(0)
+        registers.update(commands)
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client.get_schedule = AsyncMock(side_effect=get_schedule)
+        client.set_schedule = AsyncMock(side_effect=set_schedule)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        await coordinator.async_get_schedule()
+
+        # The second call restores row 0 and must see the first call's write to do so
+        await asyncio.gather(
+            coordinator.async_set_schedule(build_schedule_commands(0, 0, 31, [(2, 8, 0, 18, 0)])),
+            coordinator.async_set_schedule(build_schedule_commands(0, 0, 127, [(2, 8, 0, 18, 0)])),
+        )
+        await hass.async_block_till_done()
+
+        assert client.set_schedule.call_count == 2
+        assert registers == schedule_registers(schedule_config)
+
+
+async def test_coordinator_set_schedule_rejects_conflicts(
+    hass: HomeAssistant, schedule_config: dict
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    entry.async_create_background_task.side_effect = (
+        lambda hass, target, name: hass.async_create_background_task(target, name)
+    )
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client.get_schedule = AsyncMock(return_value=schedule_config)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        # Row 0 already runs NORMAL 08:00-18:00 every day
+        with pytest.raises(ValueError, match="Program 0, Mon: 17:00-19:00 \\(row 1\\) overlaps"):
+            await coordinator.async_set_schedule(
+                build_schedule_commands(0, 1, 1, [(4, 17, 0, 19, 0)])
+            )
+        client.set_schedule.assert_not_called()
+
+        await coordinator.async_set_schedule(build_schedule_commands(1, 0, 1, [(4, 17, 0, 19, 0)]))
+        client.set_schedule.assert_called_once()
+
+
+async def test_coordinator_saves_snapshot(
+    hass: HomeAssistant,
+    device_payloads: dict[str, bytes],
+    schedule_config: dict,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        client.get_schedule = AsyncMock(return_value=schedule_config)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        await coordinator.async_refresh()
+        await coordinator.config.async_refresh()
+        await coordinator.async_get_schedule()
+
+        assert f"{DOMAIN}.test_entry" not in hass_storage
+        freezer.tick(timedelta(seconds=301))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+        snapshot = hass_storage[f"{DOMAIN}.test_entry"]["data"]
+        assert snapshot["state"]["mode"] == "NORMALNY"
+        assert snapshot["config"]["263"] == "215"
+        assert snapshot["schedule"] == schedule_config
+
+        # Shutdown writes a pending snapshot immediately and leaves nothing queued
+        device_payloads["/i.asp"] = device_payloads["/i.asp"].replace(b"NORMALNY", b"TURBO")
+        await coordinator.async_refresh()
+        await coordinator.async_shutdown()
+        assert hass_storage[f"{DOMAIN}.test_entry"]["data"]["state"]["mode"] == "TURBO"
+
+        del hass_storage[f"{DOMAIN}.test_entry"]
+        coordinator.config.async_set_updated_data({263: "220"})
+        coordinator._async_schedule_save()
+        freezer.tick(timedelta(seconds=301))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+        assert f"{DOMAIN}.test_entry" not in hass_storage
+
+
+async def test_coordinator_restores_snapshot(
+    hass: HomeAssistant,
+    mock_state: KomfoventState,
+    device_payloads: dict[str, bytes],
+    schedule_config: dict,
+    hass_storage: dict[str, Any],
+) -> None:
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    hass_storage[f"{DOMAIN}.test_entry"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry",
+        "data": {
+            "state": asdict(mock_state),
+            "config": {"263": "215"},
+            "schedule": schedule_config,
+        },
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        client.get_schedule = AsyncMock(return_value=schedule_config)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        assert await coordinator.async_restore_snapshot()
+        assert coordinator.data == mock_state
+        assert coordinator.config.data == {263: "215"}
+        assert coordinator.timeline is not None
+        assert coordinator.stale
+
+        # The restored schedule is shown but never counts as fresh
+        await coordinator.async_get_schedule()
+        client.get_schedule.assert_called_once()
+
+        # Confirming the restored values reaches entities even when nothing else changed
+        listener = MagicMock()
+        coordinator.async_add_listener(listener, lambda data: None)
+        await coordinator.async_refresh()
+        assert not coordinator.stale
+        listener.assert_called_once()
+
+        assert coordinator.config.stale
+        await coordinator.config.async_refresh()
+        assert not coordinator.config.stale
+        await coordinator.async_shutdown()
+
+
+async def test_coordinator_restore_skips_incompatible_state(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient"):
+        coordinator = KomfoventCoordinator(hass, entry)
+        assert not await coordinator.async_restore_snapshot()
+
+        hass_storage[f"{DOMAIN}.test_entry"] = {
+            "version": 1,
+            "key": f"{DOMAIN}.test_entry",
+            "data": {"state": {"mode": "NORMAL"}, "config": None, "schedule": None},
+        }
+        coordinator = KomfoventCoordinator(hass, entry)
+        assert not await coordinator.async_restore_snapshot()
+        assert coordinator.data is None
+
+
+async def test_config_coordinator_reads_registers(
+    hass: HomeAssistant, device_payloads: dict[str, bytes]
+) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+    entry.async_create_background_task.side_effect = (
+        lambda hass, target, name: hass.async_create_background_task(target, name)
+    )
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = make_request_mock(device_payloads)
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+        registers = await coordinator.config._async_update_data()
+
+        assert registers[247] == "40"
+        assert registers[263] == "215"
+        assert registers[271] == "on"
+        assert registers[272] == "0"
+        assert registers[245] == "150"
+        assert coordinator.config.device_info == coordinator.device_info
+
+        coordinator.config.data = registers
+        await coordinator.config.async_write_register(263, "220")
+        client._request.assert_called_with("/", {"263": "220"})
+        assert coordinator.config.data[263] == "220"
+        assert coordinator.config.data[247] == "40"
+
+
+async def test_config_coordinator_read_error(hass: HomeAssistant) -> None:
+    entry = MagicMock()
+    entry.data = {
+        CONF_HOST: "192.168.0.137",
+        CONF_USERNAME: "user",
+        CONF_PASSWORD: "pass",
+        CONF_SCAN_INTERVAL: 30,
+    }
+
+    with patch("custom_components.pykomfovent.coordinator.KomfoventClient") as mock_client_class:
+        client = AsyncMock()
+        client._request = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+        mock_client_class.return_value = client
+
+        coordinator = KomfoventCoordinator(hass, entry)
+
+        with pytest.raises(UpdateFailed) as exc_info:
+            await coordinator.config._async_update_data()
+        assert exc_info.value.retry_after == MAX_SCAN_INTERVAL
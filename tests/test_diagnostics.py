@@ -1,3 +1,4 @@
+from datetime import timedelta
 from unittest.mock import MagicMock
 
 from homeassistant.core import HomeAssistant
@@ -12,6 +13,14 @@ async def test_diagnostics(hass: HomeAssistant, mock_state: KomfoventState) -> N
     coordinator = MagicMock()
     coordinator.data = mock_state
     coordinator.host = "192.168.0.137"
+    coordinator.update_interval = timedelta(seconds=30)
+    coordinator.adaptive_polling = False
+    coordinator.stale = True
+    coordinator.failures = 2
+    coordinator.retry_after = 45.5
+    coordinator.transport.payload_hits = 3
+    coordinator.transport.payload_misses = 1
+    coordinator.transport.payload_hit_rate = 0.75
 
     entry = MockConfigEntry(
         domain=DOMAIN,
@@ -29,16 +38,29 @@ async def test_diagnostics(hass: HomeAssistant, mock_state: KomfoventState) -> N
     assert result["config_entry"]["entry_id"] == "test_entry"
     assert "device" in result
     assert result["device"]["host"] == "192.168.0.137"
+    assert result["snapshot"] == {"stale": True}
+    assert result["backoff"] == {"failures": 2, "retry_after": 45.5}
     assert "state" in result
     assert result["state"]["mode"] == "NORMALNY"
     assert result["state"]["supply_temp"] == 21.5
     assert result["state"]["is_on"] is True
     assert result["state"]["flags_binary"] == "0b0"
+    assert result["polling"] == {"update_interval": 30.0, "adaptive": False}
+    assert result["payload_cache"] == {"hits": 3, "misses": 1, "hit_rate": 0.75}
 
 
 async def test_diagnostics_no_data(hass: HomeAssistant) -> None:
     coordinator = MagicMock()
     coordinator.data = None
+    coordinator.host = "192.168.0.137"
+    coordinator.update_interval = timedelta(seconds=30)
+    coordinator.adaptive_polling = False
+    coordinator.stale = False
+    coordinator.failures = 3
+    coordinator.retry_after = 150.0
+    coordinator.transport.payload_hits = 0
+    coordinator.transport.payload_misses = 0
+    coordinator.transport.payload_hit_rate = 0.0
 
     entry = MockConfigEntry(
         domain=DOMAIN,
@@ -52,4 +74,7 @@ async def test_diagnostics_no_data(hass: HomeAssistant) -> None:
 
     result = await async_get_config_entry_diagnostics(hass, entry)
 
-    assert result == {"error": "No data available"}
+    assert result["error"] == "No data available"
+    assert "state" not in result
+    assert result["backoff"] == {"failures": 3, "retry_after": 150.0}
+    assert result["polling"] == {"update_interval": 30.0, "adaptive": False}
@@ -1,14 +1,23 @@
+import asyncio
+from dataclasses import asdict
+from datetime import timedelta
+from typing import Any
 from unittest.mock import AsyncMock, MagicMock
 
+from freezegun.api import FrozenDateTimeFactory
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.core import HomeAssistant
-from pykomfovent import KomfoventState
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from homeassistant.helpers import device_registry as dr
+from pykomfovent import KomfoventConnectionError, KomfoventState
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
 
 from custom_components.pykomfovent.const import (
+    CONF_BACKGROUND_SETUP,
     CONF_HOST,
     CONF_PASSWORD,
     CONF_SCAN_INTERVAL,
     CONF_USERNAME,
+    DATA_DEVICE_INDEX,
     DOMAIN,
 )
 
@@ -40,6 +49,11 @@ async def test_setup_entry(
     assert DOMAIN in hass.data
     assert entry.entry_id in hass.data[DOMAIN]
 
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    device = dr.async_get(hass).async_get_device(identifiers={(DOMAIN, "192.168.0.137")})
+    assert device is not None
+    assert hass.data[DATA_DEVICE_INDEX] == {device.id: coordinator, "192.168.0.137": coordinator}
+
 
 async def test_unload_entry(hass: HomeAssistant, mock_client: AsyncMock) -> None:
     entry = MockConfigEntry(
@@ -62,10 +76,61 @@ async def test_unload_entry(hass: HomeAssistant, mock_client: AsyncMock) -> None
     await hass.config_entries.async_setup(entry.entry_id)
     await hass.async_block_till_done()
 
+    # A coalesced write still pending at unload reaches the unit before the client closes
+    calls: list[str] = []
+    request = mock_client._request.side_effect
+
+    async def tracked_request(path: str, extra_data: dict[str, str] | None = None) -> bytes:
+        calls.append(f"request {path}")
+        return await request(path, extra_data)
+
+    mock_client._request.side_effect = tracked_request
+    mock_client.close.side_effect = lambda: calls.append("close")
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    write = hass.async_create_task(coordinator.config.async_write_register(247, "40"))
+    await asyncio.sleep(0)
+
     await hass.config_entries.async_unload(entry.entry_id)
     await hass.async_block_till_done()
+    await write
 
+    assert calls == ["request /", "close"]
     assert entry.entry_id not in hass.data[DOMAIN]
+    assert hass.data[DATA_DEVICE_INDEX] == {}
+
+
+async def test_remove_entry_leaves_no_snapshot(
+    hass: HomeAssistant,
+    mock_client: AsyncMock,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Komfovent",
+        data={
+            CONF_HOST: "192.168.0.137",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "pass",
+            CONF_SCAN_INTERVAL: 30,
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+
+    mock_http = MagicMock()
+    mock_http.async_register_static_paths = AsyncMock()
+    hass.http = mock_http
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+
+    freezer.tick(timedelta(seconds=400))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.test_entry" not in hass_storage
 
 
 async def test_unload_entry_keeps_services_with_other_entries(
@@ -108,3 +173,90 @@ async def test_unload_entry_keeps_services_with_other_entries(
     assert "fake_entry_2" in hass.data[DOMAIN]
     # Services should still exist
     assert hass.services.has_service(DOMAIN, "set_mode")
+
+
+async def test_setup_entry_from_snapshot_with_offline_unit(
+    hass: HomeAssistant,
+    mock_state: KomfoventState,
+    mock_client: AsyncMock,
+    hass_storage: dict[str, Any],
+) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Komfovent",
+        data={
+            CONF_HOST: "192.168.0.137",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "pass",
+            CONF_SCAN_INTERVAL: 30,
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    hass_storage[f"{DOMAIN}.test_entry"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry",
+        "data": {"state": asdict(mock_state), "config": None, "schedule": None},
+    }
+    mock_client._request.side_effect = KomfoventConnectionError("offline")
+    mock_client.get_schedule.side_effect = KomfoventConnectionError("offline")
+
+    mock_http = MagicMock()
+    mock_http.async_register_static_paths = AsyncMock()
+    hass.http = mock_http
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.data == mock_state
+    assert coordinator.stale
+    assert not coordinator.last_update_success
+    # Entities keep showing the restored values, flagged as stale
+    state = hass.states.get("sensor.komfovent_192_168_0_137_mode")
+    assert state.state == "NORMALNY"
+    assert state.attributes["stale"] is True
+
+    await hass.config_entries.async_remove(entry.entry_id)
+    await hass.async_block_till_done()
+    assert f"{DOMAIN}.test_entry" not in hass_storage
+
+
+async def test_setup_entry_in_background(
+    hass: HomeAssistant, mock_state: KomfoventState, mock_client: AsyncMock
+) -> None:
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="Komfovent",
+        data={
+            CONF_HOST: "192.168.0.137",
+            CONF_USERNAME: "user",
+            CONF_PASSWORD: "pass",
+            CONF_SCAN_INTERVAL: 30,
+            CONF_BACKGROUND_SETUP: True,
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    request = mock_client._request.side_effect
+    mock_client._request.side_effect = KomfoventConnectionError("offline")
+
+    mock_http = MagicMock()
+    mock_http.async_register_static_paths = AsyncMock()
+    hass.http = mock_http
+
+    await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert entry.state is ConfigEntryState.LOADED
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.data is None
+    assert not coordinator.last_update_success
+    assert hass.states.get("sensor.komfovent_192_168_0_137_mode").state == "unavailable"
+
+    mock_client._request.side_effect = request
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert coordinator.data == mock_state
+    assert hass.states.get("sensor.komfovent_192_168_0_137_mode").state == "NORMALNY"
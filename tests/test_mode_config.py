@@ -49,9 +49,7 @@ async def test_mode_config_switches_setup(hass: HomeAssistant) -> None:
 
 async def test_mode_config_number_set(hass: HomeAssistant) -> None:
     coordinator = MagicMock()
-    coordinator.host = "192.168.0.137"
-    coordinator.device_info = {}
-    coordinator.client = AsyncMock()
+    coordinator.config.async_write_register = AsyncMock()
 
     entry = MagicMock()
     entry.entry_id = "test_entry"
@@ -63,24 +61,22 @@ async def test_mode_config_number_set(hass: HomeAssistant) -> None:
 
     # Test supply fan (no multiplier)
     fan_entity = next(e for e in entities if "supply_fan" in e.entity_description.key)
-    fan_entity.async_write_ha_state = MagicMock()
     await fan_entity.async_set_native_value(50)
-    coordinator.client.set_register.assert_called_with(fan_entity.entity_description.register, "50")
+    coordinator.config.async_write_register.assert_called_with(
+        fan_entity.entity_description.register, "50"
+    )
 
     # Test temperature (multiplier 10)
     temp_entity = next(e for e in entities if "_temp" in e.entity_description.key)
-    temp_entity.async_write_ha_state = MagicMock()
     await temp_entity.async_set_native_value(21.5)
-    coordinator.client.set_register.assert_called_with(
+    coordinator.config.async_write_register.assert_called_with(
         temp_entity.entity_description.register, "215"
     )
 
 
 async def test_mode_config_switch_toggle(hass: HomeAssistant) -> None:
     coordinator = MagicMock()
-    coordinator.host = "192.168.0.137"
-    coordinator.device_info = {}
-    coordinator.client = AsyncMock()
+    coordinator.config.async_write_register = AsyncMock()
 
     entry = MagicMock()
     entry.entry_id = "test_entry"
@@ -91,12 +87,41 @@ async def test_mode_config_switch_toggle(hass: HomeAssistant) -> None:
     await async_setup_switches(hass, entry, lambda e: entities.extend(e))
 
     switch = entities[0]
-    switch.async_write_ha_state = MagicMock()
 
     await switch.async_turn_on()
-    coordinator.client.set_register.assert_called_with(switch.entity_description.register, "on")
-    assert switch.is_on is True
+    coordinator.config.async_write_register.assert_called_with(
+        switch.entity_description.register, "on"
+    )
 
     await switch.async_turn_off()
-    coordinator.client.set_register.assert_called_with(switch.entity_description.register, "0")
-    assert switch.is_on is False
+    coordinator.config.async_write_register.assert_called_with(
+        switch.entity_description.register, "0"
+    )
+
+
+async def test_mode_config_values_from_registers(hass: HomeAssistant) -> None:
+    coordinator = MagicMock()
+    coordinator.config.data = {263: "215", 247: "40", 271: "on", 272: "0", 248: "bad"}
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    numbers = []
+    switches = []
+    await async_setup_numbers(hass, entry, lambda e: numbers.extend(e))
+    await async_setup_switches(hass, entry, lambda e: switches.extend(e))
+
+    by_key = {e.entity_description.key: e for e in numbers + switches}
+    assert by_key["mode_away_temp"].native_value == 21.5
+    assert by_key["mode_away_supply_fan"].native_value == 40
+    assert by_key["mode_normal_supply_fan"].native_value is None
+    assert by_key["mode_intensive_supply_fan"].native_value is None
+    assert by_key["mode_away_heater"].is_on is True
+    assert by_key["mode_normal_heater"].is_on is False
+    assert by_key["mode_intensive_heater"].is_on is None
+
+    coordinator.config.data = None
+    assert by_key["mode_away_temp"].native_value is None
+    assert by_key["mode_away_heater"].is_on is None
@@ -55,8 +55,7 @@ async def test_number_set_value(hass: HomeAssistant, mock_state: KomfoventState)
     coordinator.data = mock_state
     coordinator.host = "192.168.0.137"
     coordinator.device_info = {}
-    coordinator.client = AsyncMock()
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_set_supply_temp = AsyncMock()
 
     entry = MagicMock()
     entry.entry_id = "test_entry"
@@ -71,8 +70,7 @@ async def test_number_set_value(hass: HomeAssistant, mock_state: KomfoventState)
     number = next(e for e in entities if isinstance(e, KomfoventNumber))
     await number.async_set_native_value(22.5)
 
-    coordinator.client.set_supply_temp.assert_called_once_with(22.5)
-    coordinator.async_request_refresh.assert_called_once()
+    coordinator.async_set_supply_temp.assert_called_once_with(22.5)
 
 
 async def test_number_none_data(hass: HomeAssistant) -> None:
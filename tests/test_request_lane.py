@@ -0,0 +1,134 @@
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pykomfovent import KomfoventConnectionError
+
+from custom_components.pykomfovent.request_lane import RequestLane, RequestPriority
+
+
+async def test_request_lane_runs_one_request_at_a_time(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    active, peak = 0, 0
+
+    async def request() -> None:
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0)
+        active -= 1
+
+    await asyncio.gather(*(lane.run(request, RequestPriority.READ) for _ in range(5)))
+
+    assert peak == 1
+
+
+async def test_request_lane_writes_go_first(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    gate = asyncio.Event()
+    order: list[str] = []
+
+    async def request(name: str) -> str:
+        order.append(name)
+        return name
+
+    blocker = hass.async_create_task(lane.run(gate.wait, RequestPriority.READ))
+    await asyncio.sleep(0)
+    poll = hass.async_create_task(lane.read("state", lambda: request("poll"), RequestPriority.POLL))
+    read = hass.async_create_task(lane.run(lambda: request("read"), RequestPriority.READ))
+    write = hass.async_create_task(lane.run(lambda: request("write"), RequestPriority.WRITE))
+    await asyncio.sleep(0)
+    gate.set()
+
+    assert await asyncio.gather(blocker, poll, read, write) == [True, "poll", "read", "write"]
+    assert order == ["write", "read", "poll"]
+
+
+async def test_request_lane_shares_concurrent_reads(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    request = AsyncMock(return_value="state")
+
+    other = AsyncMock(return_value="schedule")
+
+    results = await asyncio.gather(
+        lane.read("state", request), lane.read("state", request), lane.read("schedule", other)
+    )
+
+    assert results == ["state", "state", "schedule"]
+    request.assert_called_once()
+    other.assert_called_once()
+
+    await lane.read("state", request)
+    assert request.call_count == 2
+
+
+async def test_request_lane_reads_again_after_write(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    gate = asyncio.Event()
+    request = AsyncMock(return_value="state")
+
+    blocker = hass.async_create_task(lane.run(gate.wait, RequestPriority.READ))
+    await asyncio.sleep(0)
+    first = hass.async_create_task(lane.read("state", request))
+    await asyncio.sleep(0)
+    write = hass.async_create_task(lane.run(AsyncMock(), RequestPriority.WRITE))
+    second = hass.async_create_task(lane.read("state", request))
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(blocker, first, write, second)
+
+    assert request.call_count == 2
+
+
+async def test_request_lane_error_releases_lane(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    failing = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+
+    results = await asyncio.gather(
+        lane.read("state", failing), lane.read("state", failing), return_exceptions=True
+    )
+
+    assert all(isinstance(r, KomfoventConnectionError) for r in results)
+    failing.assert_called_once()
+    assert await lane.run(AsyncMock(return_value=1), RequestPriority.READ) == 1
+
+
+async def test_request_lane_cancelled_waiter(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    gate = asyncio.Event()
+    skipped = AsyncMock()
+
+    blocker = hass.async_create_task(lane.run(gate.wait, RequestPriority.READ))
+    await asyncio.sleep(0)
+    waiting = hass.async_create_task(lane.run(skipped, RequestPriority.READ))
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    gate.set()
+    await blocker
+
+    skipped.assert_not_called()
+    assert await lane.run(AsyncMock(return_value=1), RequestPriority.WRITE) == 1
+
+
+async def test_request_lane_cancelled_after_handover(hass: HomeAssistant) -> None:
+    lane = RequestLane(hass)
+    gate = asyncio.Event()
+    skipped = AsyncMock()
+
+    blocker = hass.async_create_task(lane.run(gate.wait, RequestPriority.READ))
+    await asyncio.sleep(0)
+    waiting = hass.async_create_task(lane.run(skipped, RequestPriority.READ))
+    await asyncio.sleep(0)
+    # Hand the lane over and cancel the waiter before it gets to run
+    gate.set()
+    await asyncio.sleep(0)
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    await blocker
+
+    skipped.assert_not_called()
+    assert await lane.run(AsyncMock(return_value=1), RequestPriority.READ) == 1
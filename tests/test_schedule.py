@@ -1,9 +1,19 @@
+from datetime import datetime
+
+import pytest
+
 from custom_components.pykomfovent.schedule import (
+    Schedule,
     ScheduleEntry,
     ScheduleMode,
     ScheduleRow,
+    ScheduleTimeline,
     build_schedule_commands,
+    compile_schedule,
     parse_schedule_config,
+    registers_schedule,
+    schedule_registers,
+    validate_schedule,
 )
 
 
@@ -65,3 +75,226 @@ def test_build_schedule_commands() -> None:
     # Remaining entries cleared
     assert commands["622"] == 1
     assert commands["302"] == 0
+
+
+def test_schedule_registers() -> None:
+    data = {
+        "wmask": [127] + [0] * 15,
+        "mode": [2] + [1] * 79,
+        "start": [480] + [0] * 79,
+        "stop": [1080] + [0] * 79,
+    }
+    registers = schedule_registers(data)
+
+    assert len(registers) == 16 + 80 * 3
+    assert registers["700"] == 127
+    assert registers["715"] == 0
+    assert registers["620"] == 2
+    assert registers["300"] == 480
+    assert registers["380"] == 1080
+    assert registers["459"] == 0
+    assert build_schedule_commands(0, 0, 127, [(2, 8, 0, 18, 0)]).items() <= registers.items()
+
+
+def test_schedule_timeline() -> None:
+    schedule = Schedule(
+        program=0,
+        rows=[
+            ScheduleRow(
+                weekday_mask=31,  # Mon-Fri
+                entries=[
+                    ScheduleEntry(ScheduleMode.NORMAL, 7, 0, 22, 0),
+                    ScheduleEntry(ScheduleMode.AWAY, 22, 0, 7, 0),  # past midnight
+                ],
+            ),
+            ScheduleRow(
+                weekday_mask=64,  # Sun
+                entries=[ScheduleEntry(ScheduleMode.BOOST, 12, 0, 12, 30)],
+            ),
+        ],
+    )
+    timeline = ScheduleTimeline.from_schedule(schedule)
+
+    monday = datetime(2026, 10, 12, 6, 59, 30)
+    assert monday.weekday() == 0
+    assert timeline.mode_at(monday) is None
+    assert timeline.next_transition(monday) == (datetime(2026, 10, 12, 7, 0), ScheduleMode.NORMAL)
+    assert timeline.mode_at(datetime(2026, 10, 12, 7, 0)) == ScheduleMode.NORMAL
+    assert timeline.mode_at(datetime(2026, 10, 13, 3, 0)) == ScheduleMode.AWAY
+    # Friday's away period runs into Saturday, then nothing until Sunday noon
+    assert timeline.mode_at(datetime(2026, 10, 17, 6, 0)) == ScheduleMode.AWAY
+    assert timeline.next_transition(datetime(2026, 10, 17, 8, 0)) == (
+        datetime(2026, 10, 18, 12, 0),
+        ScheduleMode.BOOST,
+    )
+    # Wraps from Sunday into next Monday
+    assert timeline.next_transition(datetime(2026, 10, 18, 13, 0)) == (
+        datetime(2026, 10, 19, 7, 0),
+        ScheduleMode.NORMAL,
+    )
+
+
+def test_schedule_timeline_occurrences() -> None:
+    timeline = ScheduleTimeline.from_schedule(
+        Schedule(
+            program=0,
+            rows=[ScheduleRow(64, [ScheduleEntry(ScheduleMode.AWAY, 22, 0, 7, 0)])],  # Sun
+        )
+    )
+    assert timeline.runs == ((9960, 10500, ScheduleMode.AWAY),)
+
+    # The period starting Sunday evening is still reported on Monday morning
+    occurrences = list(
+        timeline.occurrences(datetime(2026, 10, 19, 6, 0), datetime(2026, 11, 2, 0, 0))
+    )
+    assert occurrences == [
+        (datetime(2026, 10, 18, 22, 0), datetime(2026, 10, 19, 7, 0), ScheduleMode.AWAY),
+        (datetime(2026, 10, 25, 22, 0), datetime(2026, 10, 26, 7, 0), ScheduleMode.AWAY),
+        (datetime(2026, 11, 1, 22, 0), datetime(2026, 11, 2, 7, 0), ScheduleMode.AWAY),
+    ]
+
+
+def test_schedule_timeline_constant() -> None:
+    always = ScheduleTimeline.from_schedule(
+        Schedule(
+            program=0,
+            rows=[ScheduleRow(127, [ScheduleEntry(ScheduleMode.NORMAL, 0, 0, 24, 0)])],
+        )
+    )
+    assert always.transitions == ()
+    assert always.mode_at(datetime(2026, 10, 14, 12, 0)) == ScheduleMode.NORMAL
+    assert always.next_transition(datetime(2026, 10, 14, 12, 0)) is None
+    assert next(always.occurrences(datetime(2026, 10, 14, 12, 0), datetime(2026, 10, 15))) == (
+        datetime(2026, 10, 12),
+        datetime(2026, 10, 19),
+        ScheduleMode.NORMAL,
+    )
+
+    empty = ScheduleTimeline.from_schedule(Schedule(program=1, rows=[]))
+    assert empty.mode_at(datetime(2026, 10, 14, 12, 0)) is None
+    assert list(empty.occurrences(datetime(2026, 10, 14), datetime(2026, 10, 21))) == []
+
+
+def test_compile_schedule() -> None:
+    normal, away = ScheduleMode.NORMAL, ScheduleMode.AWAY
+    weekday = [(normal, 420, 720), (normal, 720, 1320), (away, 0, 420)]
+    weekend = [(normal, 540, 1380)]
+    commands = compile_schedule(1, [weekday] * 5 + [weekend] * 2)
+
+    assert len(commands) == 4 * 16
+    # Row 0: Mon-Fri, away then the merged normal interval
+    assert commands["704"] == 31
+    assert [commands["640"], commands["320"], commands["400"]] == [1, 0, 420]
+    assert [commands["641"], commands["321"], commands["401"]] == [2, 420, 1320]
+    assert [commands["642"], commands["322"], commands["402"]] == [1, 0, 0]
+    # Row 1: Sat-Sun
+    assert commands["705"] == 96
+    assert [commands["645"], commands["325"], commands["405"]] == [2, 540, 1380]
+    # Remaining rows cleared
+    assert commands["706"] == 0
+    assert commands["707"] == 0
+
+    timeline = ScheduleTimeline.from_schedule(
+        parse_schedule_config(
+            {
+                "wmask": [commands.get(str(700 + r), 0) for r in range(16)],
+                "mode": [commands.get(str(620 + e), 1) for e in range(80)],
+                "start": [commands.get(str(300 + e), 0) for e in range(80)],
+                "stop": [commands.get(str(380 + e), 0) for e in range(80)],
+            }
+        )[1]
+    )
+    assert timeline.mode_at(datetime(2026, 10, 14, 12, 0)) == normal
+    assert timeline.mode_at(datetime(2026, 10, 18, 8, 0)) is None
+
+
+def test_compile_schedule_stop_at_midnight() -> None:
+    normal, away = ScheduleMode.NORMAL, ScheduleMode.AWAY
+    midnight = compile_schedule(0, [[(normal, 0, 1320), (away, 1320, 0)]] * 7)
+
+    assert midnight == compile_schedule(0, [[(normal, 0, 1320), (away, 1320, 1440)]] * 7)
+    assert [midnight["620"], midnight["300"], midnight["380"]] == [2, 0, 1320]
+    assert [midnight["621"], midnight["301"], midnight["381"]] == [1, 1320, 1440]
+
+
+@pytest.mark.parametrize(
+    ("days", "reason"),
+    [
+        ([[]] * 6, "needs 7 days"),
+        ([[(ScheduleMode.NORMAL, 600, 500)]] + [[]] * 6, "Mon: invalid interval 10:00-08:20"),
+        (
+            [[(ScheduleMode.NORMAL, 0, 600), (ScheduleMode.AWAY, 500, 700)]] + [[]] * 6,
+            "Mon: 08:20-11:40 overlaps 00:00-10:00",
+        ),
+        (
+            [[], [(ScheduleMode(1 + i % 4), i * 60, i * 60 + 30) for i in range(6)]] + [[]] * 5,
+            "Tue needs 6 entries but a row holds 5",
+        ),
+        (
+            [[(ScheduleMode.NORMAL, 0, 60 * (i + 1))] for i in range(7)],
+            "7 distinct days but a program holds 4 rows",
+        ),
+    ],
+)
+def test_compile_schedule_does_not_fit(days: list, reason: str) -> None:
+    with pytest.raises(ValueError, match=reason):
+        compile_schedule(0, days)
+
+
+def test_registers_schedule_round_trip() -> None:
+    data = {
+        "wmask": [127] + [0] * 15,
+        "mode": [2] + [1] * 79,
+        "start": [480] + [0] * 79,
+        "stop": [1080] + [0] * 79,
+    }
+    assert registers_schedule(schedule_registers(data)) == data
+
+
+def test_validate_schedule_accepts_disjoint_rows() -> None:
+    validate_schedule(
+        Schedule(
+            program=0,
+            rows=[
+                ScheduleRow(31, [ScheduleEntry(ScheduleMode.NORMAL, 7, 0, 22, 0)]),
+                ScheduleRow(96, [ScheduleEntry(ScheduleMode.NORMAL, 8, 0, 23, 0)]),
+                ScheduleRow(127, [ScheduleEntry(ScheduleMode.AWAY, 23, 0, 7, 0)]),
+            ],
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    ("rows", "reason"),
+    [
+        (
+            [
+                ScheduleRow(
+                    1,
+                    [
+                        ScheduleEntry(ScheduleMode.NORMAL, 8, 0, 18, 0),
+                        ScheduleEntry(ScheduleMode.BOOST, 17, 0, 19, 0),
+                    ],
+                )
+            ],
+            r"Program 2, Mon: 17:00-19:00 \(row 0\) overlaps 08:00-18:00 \(row 0\)",
+        ),
+        (
+            [
+                ScheduleRow(31, [ScheduleEntry(ScheduleMode.NORMAL, 8, 0, 18, 0)]),
+                ScheduleRow(20, [ScheduleEntry(ScheduleMode.AWAY, 12, 0, 13, 0)]),
+            ],
+            r"Wed: 12:00-13:00 \(row 1\) overlaps 08:00-18:00 \(row 0\)",
+        ),
+        (
+            [
+                ScheduleRow(64, [ScheduleEntry(ScheduleMode.AWAY, 22, 0, 7, 0)]),
+                ScheduleRow(1, [ScheduleEntry(ScheduleMode.NORMAL, 6, 0, 22, 0)]),
+            ],
+            r"Mon: 06:00-22:00 \(row 1\) overlaps 22:00-07:00 \(row 0\)",
+        ),
+    ],
+)
+def test_validate_schedule_rejects_overlaps(rows: list[ScheduleRow], reason: str) -> None:
+    with pytest.raises(ValueError, match=reason):
+        validate_schedule(Schedule(program=2, rows=rows))
@@ -53,8 +53,7 @@ async def test_select_set_option(hass: HomeAssistant, mock_state: KomfoventState
     coordinator.data = mock_state
     coordinator.host = "192.168.0.137"
     coordinator.device_info = {}
-    coordinator.client = AsyncMock()
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.async_set_mode = AsyncMock()
 
     entry = MagicMock()
     entry.entry_id = "test_entry"
@@ -69,8 +68,7 @@ async def test_select_set_option(hass: HomeAssistant, mock_state: KomfoventState
     select = entities[0]
     await select.async_select_option("intensive")
 
-    coordinator.client.set_mode.assert_called_once_with("intensive")
-    coordinator.async_request_refresh.assert_called_once()
+    coordinator.async_set_mode.assert_called_once_with("intensive")
 
 
 async def test_select_options(hass: HomeAssistant, mock_state: KomfoventState) -> None:
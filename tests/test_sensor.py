@@ -1,10 +1,14 @@
+from datetime import datetime
 from unittest.mock import MagicMock
 
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 from pykomfovent import KomfoventState
 
 from custom_components.pykomfovent.const import DOMAIN
-from custom_components.pykomfovent.sensor import SENSORS, async_setup_entry
+from custom_components.pykomfovent.schedule import ScheduleTimeline, parse_schedule_config
+from custom_components.pykomfovent.sensor import SCHEDULE_SENSORS, SENSORS, async_setup_entry
 from tests.conftest import make_add_entities
 
 
@@ -29,7 +33,7 @@ async def test_sensor_setup(hass: HomeAssistant, mock_state: KomfoventState) ->
 
     await async_setup_entry(hass, entry, async_add_entities)
 
-    assert len(entities) == len(SENSORS)
+    assert len(entities) == len(SENSORS) + len(SCHEDULE_SENSORS)
 
 
 async def test_sensor_values(hass: HomeAssistant, mock_state: KomfoventState) -> None:
@@ -63,6 +67,12 @@ async def test_sensor_values(hass: HomeAssistant, mock_state: KomfoventState) ->
     power = next(e for e in entities if e.entity_description.key == "power_consumption")
     assert power.native_value == 55.0
 
+    # Values restored from the snapshot are flagged until the unit confirms them
+    coordinator.stale = True
+    assert mode_sensor.extra_state_attributes == {"stale": True}
+    coordinator.stale = False
+    assert mode_sensor.extra_state_attributes == {"stale": False}
+
 
 async def test_sensor_none_data(hass: HomeAssistant) -> None:
     coordinator = MagicMock()
@@ -109,3 +119,44 @@ async def test_sensor_unique_ids(hass: HomeAssistant, mock_state: KomfoventState
     assert len(unique_ids) == len(set(unique_ids))  # All unique
     assert "192.168.0.137_mode" in unique_ids
     assert "192.168.0.137_supply_temp" in unique_ids
+
+
+async def test_schedule_sensors(
+    hass: HomeAssistant,
+    mock_state: KomfoventState,
+    schedule_config: dict,
+    freezer: FrozenDateTimeFactory,
+) -> None:
+    freezer.move_to("2026-10-14 19:00:00+00:00")  # Wednesday 12:00 US/Pacific
+    coordinator = MagicMock()
+    coordinator.data = mock_state
+    coordinator.host = "192.168.0.137"
+    coordinator.device_info = {}
+    coordinator.timeline = None
+
+    entry = MagicMock()
+    entry.entry_id = "test_entry"
+
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    entities = []
+    async_add_entities = make_add_entities(entities)
+
+    await async_setup_entry(hass, entry, async_add_entities)
+
+    next_mode = next(e for e in entities if e.entity_description.key == "next_scheduled_mode")
+    next_change = next(e for e in entities if e.entity_description.key == "next_scheduled_change")
+    assert next_mode.native_value is None
+    assert next_change.native_value is None
+
+    coordinator.timeline = ScheduleTimeline.from_schedule(parse_schedule_config(schedule_config)[0])
+    tz = dt_util.get_default_time_zone()
+    assert next_mode.native_value == "unscheduled"
+    assert next_change.native_value == datetime(2026, 10, 14, 18, 0, tzinfo=tz)
+
+    freezer.move_to("2026-10-15 01:00:00+00:00")
+    assert next_mode.native_value == "normal"
+    assert next_change.native_value == datetime(2026, 10, 15, 8, 0, tzinfo=tz)
+
+    await next_mode.async_added_to_hass()
+    coordinator.async_add_schedule_listener.assert_called_once_with(next_mode.async_write_ha_state)
@@ -1,9 +1,15 @@
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
+import pytest
+from freezegun.api import FrozenDateTimeFactory
 from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from pykomfovent import KomfoventConnectionError
 
-from custom_components.pykomfovent.const import DOMAIN
+from custom_components.pykomfovent.const import DATA_DEVICE_INDEX, DOMAIN
 from custom_components.pykomfovent.coordinator import KomfoventCoordinator
+from custom_components.pykomfovent.schedule import ScheduleTimeline, parse_schedule_config
 from custom_components.pykomfovent.services import async_setup_services, async_unload_services
 
 
@@ -14,6 +20,9 @@ async def test_setup_services(hass: HomeAssistant) -> None:
     assert hass.services.has_service(DOMAIN, "set_temperature")
     assert hass.services.has_service(DOMAIN, "get_schedule")
     assert hass.services.has_service(DOMAIN, "set_schedule")
+    assert hass.services.has_service(DOMAIN, "set_schedules")
+    assert hass.services.has_service(DOMAIN, "set_weekly_schedule")
+    assert hass.services.has_service(DOMAIN, "apply_profile")
 
 
 async def test_unload_services(hass: HomeAssistant) -> None:
@@ -24,12 +33,14 @@ async def test_unload_services(hass: HomeAssistant) -> None:
     assert not hass.services.has_service(DOMAIN, "set_temperature")
     assert not hass.services.has_service(DOMAIN, "get_schedule")
     assert not hass.services.has_service(DOMAIN, "set_schedule")
+    assert not hass.services.has_service(DOMAIN, "set_schedules")
+    assert not hass.services.has_service(DOMAIN, "set_weekly_schedule")
+    assert not hass.services.has_service(DOMAIN, "apply_profile")
 
 
 async def test_set_mode_service(hass: HomeAssistant) -> None:
     coordinator = MagicMock(spec=KomfoventCoordinator)
-    coordinator.client = AsyncMock()
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.host = "192.168.0.137"
 
     hass.data[DOMAIN] = {"entry1": coordinator}
 
@@ -37,14 +48,37 @@ async def test_set_mode_service(hass: HomeAssistant) -> None:
 
     await hass.services.async_call(DOMAIN, "set_mode", {"mode": "intensive"}, blocking=True)
 
-    coordinator.client.set_mode.assert_called_once_with("intensive")
-    coordinator.async_request_refresh.assert_called_once()
+    coordinator.async_set_mode.assert_called_once_with("intensive")
+
+
+async def test_set_mode_service_targets_device(hass: HomeAssistant) -> None:
+    target = MagicMock(spec=KomfoventCoordinator)
+    target.host = "192.168.0.137"
+    other = MagicMock(spec=KomfoventCoordinator)
+    other.host = "192.168.0.138"
+
+    hass.data[DOMAIN] = {"entry1": target, "entry2": other}
+    hass.data[DATA_DEVICE_INDEX] = {"device1": target, "192.168.0.137": target}
+
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN, "set_mode", {"mode": "intensive", "device_id": "device1"}, blocking=True
+    )
+    await hass.services.async_call(
+        DOMAIN, "set_mode", {"mode": "away", "device_id": "192.168.0.137"}, blocking=True
+    )
+    await hass.services.async_call(
+        DOMAIN, "set_mode", {"mode": "away", "device_id": "unknown"}, blocking=True
+    )
+
+    assert target.async_set_mode.call_count == 2
+    other.async_set_mode.assert_not_called()
 
 
 async def test_set_temperature_service(hass: HomeAssistant) -> None:
     coordinator = MagicMock(spec=KomfoventCoordinator)
-    coordinator.client = AsyncMock()
-    coordinator.async_request_refresh = AsyncMock()
+    coordinator.host = "192.168.0.137"
 
     hass.data[DOMAIN] = {"entry1": coordinator}
 
@@ -52,22 +86,18 @@ async def test_set_temperature_service(hass: HomeAssistant) -> None:
 
     await hass.services.async_call(DOMAIN, "set_temperature", {"temperature": 22.5}, blocking=True)
 
-    coordinator.client.set_supply_temp.assert_called_once_with(22.5)
-    coordinator.async_request_refresh.assert_called_once()
+    coordinator.async_set_supply_temp.assert_called_once_with(22.5)
 
 
-async def test_get_schedule_service(hass: HomeAssistant) -> None:
+async def test_get_schedule_service(
+    hass: HomeAssistant, schedule_config: dict, freezer: FrozenDateTimeFactory
+) -> None:
+    freezer.move_to("2026-10-14 19:00:00+00:00")  # Wednesday 12:00 US/Pacific
     coordinator = MagicMock(spec=KomfoventCoordinator)
-    coordinator.client = AsyncMock()
-    coordinator.client.get_schedule = AsyncMock(
-        return_value={
-            "current_program": 0,
-            "wmask": [127] + [0] * 15,
-            "mode": [2] + [1] * 79,
-            "start": [480] + [0] * 79,
-            "stop": [1080] + [0] * 79,
-        }
-    )
+    coordinator.host = "192.168.0.137"
+    schedules = parse_schedule_config(schedule_config)
+    coordinator.async_get_schedule = AsyncMock(return_value=(schedule_config, schedules))
+    coordinator.timeline = ScheduleTimeline.from_schedule(schedules[0])
 
     hass.data[DOMAIN] = {"entry1": coordinator}
 
@@ -77,14 +107,23 @@ async def test_get_schedule_service(hass: HomeAssistant) -> None:
         DOMAIN, "get_schedule", {}, blocking=True, return_response=True
     )
 
-    coordinator.client.get_schedule.assert_called_once()
+    coordinator.async_get_schedule.assert_called_once_with(300)
     assert result["current_program"] == 0
+    assert result["schedules"][0]["rows"][0]["entries"][0]["start"] == "08:00"
+    assert result["active_mode"] == "normal"
+    assert result["next_change"] == {"at": "2026-10-14T18:00:00-07:00", "mode": None}
+
+    coordinator.timeline = None
+
+    await hass.services.async_call(
+        DOMAIN, "get_schedule", {"max_age": 0}, blocking=True, return_response=True
+    )
+    coordinator.async_get_schedule.assert_called_with(0)
 
 
 async def test_set_schedule_service(hass: HomeAssistant) -> None:
     coordinator = MagicMock(spec=KomfoventCoordinator)
-    coordinator.client = AsyncMock()
-    coordinator.client.set_schedule = AsyncMock()
+    coordinator.host = "192.168.0.137"
 
     hass.data[DOMAIN] = {"entry1": coordinator}
 
@@ -104,8 +143,245 @@ async def test_set_schedule_service(hass: HomeAssistant) -> None:
         blocking=True,
     )
 
-    coordinator.client.set_schedule.assert_called_once()
-    call_args = coordinator.client.set_schedule.call_args[0][0]
+    coordinator.async_set_schedule.assert_called_once()
+    call_args = coordinator.async_set_schedule.call_args[0][0]
     assert call_args["700"] == 127
     assert call_args["620"] == 2  # normal
     assert call_args["300"] == 480  # 8*60
+
+
+async def test_set_schedules_service(hass: HomeAssistant) -> None:
+    coordinator = MagicMock(spec=KomfoventCoordinator)
+    coordinator.host = "192.168.0.137"
+
+    hass.data[DOMAIN] = {"entry1": coordinator}
+
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "set_schedules",
+        {
+            "programs": [
+                {
+                    "program": 0,
+                    "rows": [
+                        {
+                            "weekdays": 31,
+                            "entries": [{"mode": "normal", "start": "07:00", "stop": "22:00"}],
+                        },
+                        {
+                            "weekdays": 96,
+                            "entries": [{"mode": "boost", "start": "09:00", "stop": "10:00"}],
+                        },
+                    ],
+                },
+                {"program": 3, "rows": []},
+            ]
+        },
+        blocking=True,
+    )
+
+    coordinator.async_set_schedule.assert_called_once()
+    commands = coordinator.async_set_schedule.call_args[0][0]
+    assert len(commands) == 2 * 4 * 16
+    assert commands["700"] == 31
+    assert commands["300"] == 420
+    assert commands["701"] == 96
+    assert commands["625"] == 4
+    assert commands["702"] == 0
+    assert commands["703"] == 0
+    assert commands["712"] == 0
+    assert commands["715"] == 0
+    assert "704" not in commands
+
+
+async def test_set_schedules_service_invalid_time(hass: HomeAssistant) -> None:
+    coordinator = MagicMock(spec=KomfoventCoordinator)
+    coordinator.host = "192.168.0.137"
+
+    hass.data[DOMAIN] = {"entry1": coordinator}
+
+    await async_setup_services(hass)
+
+    with pytest.raises(ValueError, match="Invalid start time"):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_schedules",
+            {
+                "programs": [
+                    {
+                        "program": 1,
+                        "rows": [
+                            {
+                                "weekdays": 127,
+                                "entries": [{"mode": "away", "start": "25:00", "stop": "06:00"}],
+                            }
+                        ],
+                    }
+                ]
+            },
+            blocking=True,
+        )
+
+    coordinator.async_set_schedule.assert_not_called()
+
+
+async def test_set_weekly_schedule_service(hass: HomeAssistant) -> None:
+    coordinator = MagicMock(spec=KomfoventCoordinator)
+    coordinator.host = "192.168.0.137"
+
+    hass.data[DOMAIN] = {"entry1": coordinator}
+
+    await async_setup_services(hass)
+
+    workday = [
+        {"mode": "normal", "start": "07:00", "stop": "12:00"},
+        {"mode": "normal", "start": "12:00", "stop": "22:00"},
+    ]
+    await hass.services.async_call(
+        DOMAIN,
+        "set_weekly_schedule",
+        {
+            "program": 2,
+            "days": {day: workday for day in ("mon", "tue", "wed", "thu", "fri")},
+        },
+        blocking=True,
+    )
+
+    coordinator.async_set_schedule.assert_called_once()
+    commands = coordinator.async_set_schedule.call_args[0][0]
+    assert commands["708"] == 31
+    assert [commands["660"], commands["340"], commands["420"]] == [2, 420, 1320]
+    assert commands["661"] == 1
+    assert commands["709"] == 0
+
+    with pytest.raises(ValueError, match="Schedule does not fit: Sun: 07:30-08:00 overlaps"):
+        await hass.services.async_call(
+            DOMAIN,
+            "set_weekly_schedule",
+            {
+                "program": 2,
+                "days": {"sun": [*workday, {"mode": "boost", "start": "07:30", "stop": "08:00"}]},
+            },
+            blocking=True,
+        )
+    coordinator.async_set_schedule.assert_called_once()
+
+
+async def test_apply_profile_service(hass: HomeAssistant) -> None:
+    coordinator = MagicMock(spec=KomfoventCoordinator)
+    coordinator.host = "192.168.0.137"
+    coordinator.config = MagicMock()
+    coordinator.config.async_write_registers = AsyncMock()
+
+    hass.data[DOMAIN] = {"entry1": coordinator}
+
+    await async_setup_services(hass)
+
+    await hass.services.async_call(
+        DOMAIN,
+        "apply_profile",
+        {
+            "settings": {
+                "mode_normal_supply_fan": 40,
+                "mode_normal_temp": 21.5,
+                "mode_away_heater": False,
+                "eco_free_cooling": "on",
+            }
+        },
+        blocking=True,
+    )
+
+    coordinator.config.async_write_registers.assert_called_once_with(
+        {248: "40", 264: "215", 271: "0", 242: "on"}
+    )
+
+
+async def test_apply_profile_service_invalid(hass: HomeAssistant) -> None:
+    coordinator = MagicMock(spec=KomfoventCoordinator)
+    coordinator.host = "192.168.0.137"
+    coordinator.config = MagicMock()
+    coordinator.config.async_write_registers = AsyncMock()
+
+    hass.data[DOMAIN] = {"entry1": coordinator}
+
+    await async_setup_services(hass)
+
+    for settings in (
+        {"unknown_setting": 1},
+        {"mode_normal_supply_fan": 140},
+        {"mode_away_heater": "maybe"},
+    ):
+        with pytest.raises(ValueError):
+            await hass.services.async_call(
+                DOMAIN, "apply_profile", {"settings": settings}, blocking=True
+            )
+
+    coordinator.config.async_write_registers.assert_not_called()
+
+
+async def test_set_mode_service_isolates_device_errors(hass: HomeAssistant) -> None:
+    healthy = MagicMock(spec=KomfoventCoordinator)
+    healthy.host = "192.168.0.137"
+    broken = MagicMock(spec=KomfoventCoordinator)
+    broken.host = "192.168.0.138"
+    broken.async_set_mode = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+
+    hass.data[DOMAIN] = {"entry1": broken, "entry2": healthy}
+
+    await async_setup_services(hass)
+
+    result = await hass.services.async_call(
+        DOMAIN, "set_mode", {"mode": "away"}, blocking=True, return_response=True
+    )
+
+    healthy.async_set_mode.assert_called_once_with("away")
+    assert result == {
+        "succeeded": ["192.168.0.137"],
+        "failed": {"192.168.0.138": "Connection failed"},
+    }
+
+
+async def test_set_mode_service_all_devices_fail(hass: HomeAssistant) -> None:
+    coordinator = MagicMock(spec=KomfoventCoordinator)
+    coordinator.host = "192.168.0.137"
+    coordinator.async_set_mode = AsyncMock(side_effect=KomfoventConnectionError())
+
+    hass.data[DOMAIN] = {"entry1": coordinator}
+
+    await async_setup_services(hass)
+
+    with pytest.raises(HomeAssistantError, match="KomfoventConnectionError"):
+        await hass.services.async_call(DOMAIN, "set_mode", {"mode": "away"}, blocking=True)
+
+
+async def test_set_mode_service_runs_devices_concurrently(hass: HomeAssistant) -> None:
+    started = asyncio.Event()
+    release = asyncio.Event()
+    running = 0
+
+    async def slow_set_mode(mode: str) -> None:
+        nonlocal running
+        running += 1
+        if running == 2:
+            started.set()
+        await release.wait()
+
+    coordinators = {}
+    for i in range(2):
+        coordinator = MagicMock(spec=KomfoventCoordinator)
+        coordinator.host = f"192.168.0.{i}"
+        coordinator.async_set_mode = AsyncMock(side_effect=slow_set_mode)
+        coordinators[f"entry{i}"] = coordinator
+
+    hass.data[DOMAIN] = coordinators
+
+    await async_setup_services(hass)
+
+    call = hass.async_create_task(
+        hass.services.async_call(DOMAIN, "set_mode", {"mode": "away"}, blocking=True)
+    )
+    await asyncio.wait_for(started.wait(), 1)
+    release.set()
+    await call
@@ -0,0 +1,14 @@
+from custom_components.pykomfovent.transport import parse_config_registers
+
+
+def test_parse_config_registers() -> None:
+    page = b"""<form>
+        <input type="text" name="247" value="40">
+        <INPUT TYPE=checkbox NAME=271 checked>
+        <input type='checkbox' name='272'>
+        <input name=263 value='215' />
+        <input type="text" name="login" value="user">
+        <input type="submit" value="Save">
+    </form>"""
+
+    assert parse_config_registers(page) == {247: "40", 271: "on", 272: "0", 263: "215"}
@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import HomeAssistant
+from pykomfovent import KomfoventConnectionError
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.pykomfovent.const import DOMAIN
+from custom_components.pykomfovent.write_queue import RegisterWriteQueue
+
+
+async def test_write_queue_coalesces_writes(hass: HomeAssistant) -> None:
+    transport = MagicMock()
+    transport.set_registers = AsyncMock()
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=0.01)
+
+    await asyncio.gather(
+        queue.write({247: "40"}),
+        queue.write({263: "215"}),
+        queue.write({247: "45"}),
+    )
+
+    transport.set_registers.assert_called_once_with({247: "45", 263: "215"})
+
+
+async def test_write_queue_separate_windows(hass: HomeAssistant) -> None:
+    transport = MagicMock()
+    transport.set_registers = AsyncMock()
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=0.01)
+
+    await queue.write({247: "40"})
+    await queue.write({248: "50"})
+
+    assert transport.set_registers.call_count == 2
+
+
+async def test_write_queue_error_reaches_all_callers(hass: HomeAssistant) -> None:
+    transport = MagicMock()
+    transport.set_registers = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=0.01)
+
+    results = await asyncio.gather(
+        queue.write({247: "40"}), queue.write({248: "50"}), return_exceptions=True
+    )
+
+    assert all(isinstance(r, KomfoventConnectionError) for r in results)
+    transport.set_registers.assert_called_once()
+
+
+async def test_write_queue_flush(hass: HomeAssistant) -> None:
+    transport = MagicMock()
+    transport.set_registers = AsyncMock()
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=60)
+
+    write = hass.async_create_task(queue.write({247: "40"}))
+    await asyncio.sleep(0)
+    await queue.async_flush()
+    await write
+
+    transport.set_registers.assert_called_once_with({247: "40"})
+
+    # Nothing pending
+    await queue.async_flush()
+    transport.set_registers.assert_called_once()
+
+
+async def test_write_queue_flush_error(hass: HomeAssistant) -> None:
+    transport = MagicMock()
+    transport.set_registers = AsyncMock(side_effect=KomfoventConnectionError("Connection failed"))
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=60)
+
+    write = hass.async_create_task(queue.write({247: "40"}))
+    await asyncio.sleep(0)
+    await queue.async_flush()
+
+    with pytest.raises(KomfoventConnectionError):
+        await write
+
+
+async def test_write_queue_flush_waits_for_running_flush(hass: HomeAssistant) -> None:
+    gate = asyncio.Event()
+
+    async def set_registers(registers: dict[int, str]) -> None:
+        await gate.wait()
+
+    transport = MagicMock()
+    transport.set_registers = AsyncMock(side_effect=set_registers)
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=0.01)
+
+    write = hass.async_create_task(queue.write({247: "40"}))
+    await asyncio.sleep(0.02)
+    # The timer has handed the registers to a flush that is still waiting on the unit
+    transport.set_registers.assert_called_once_with({247: "40"})
+    flush = hass.async_create_task(queue.async_flush())
+    await asyncio.sleep(0)
+    assert not flush.done()
+
+    gate.set()
+    await flush
+    assert write.done()
+    await write
+
+
+async def test_write_queue_cancelled_flush_fails_callers(hass: HomeAssistant) -> None:
+    async def set_registers(registers: dict[int, str]) -> None:
+        await asyncio.Event().wait()
+
+    transport = MagicMock()
+    transport.set_registers = AsyncMock(side_effect=set_registers)
+    queue = RegisterWriteQueue(hass, MockConfigEntry(domain=DOMAIN), transport, window=0.01)
+
+    write = hass.async_create_task(queue.write({247: "40"}))
+    await asyncio.sleep(0.02)
+    # As on entry unload, which cancels the entry's background tasks
+    assert queue._flush_task is not None
+    queue._flush_task.cancel()
+
+    with pytest.raises(KomfoventConnectionError):
+        await write